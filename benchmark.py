@@ -0,0 +1,321 @@
+
+# benchmark.py - Medição de desempenho do OrganizePY
+# Gera árvores sintéticas reproduzíveis (quantidade de arquivos, profundidade, tamanhos,
+# extensões de TIPOS e nomes repetidos) e mede cada fase separadamente: coleta por padrões,
+# nomes únicos, varredura, plano e movimento. O resultado sai em JSON para comparar execuções.
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+
+from organizer import (TIPOS, SCAN_WORKERS, NameRegistry, RunMetrics, SourceScanner,
+                       collect_files_for_patterns, make_unique_path, organize, parse_size,
+                       plan_organization)
+
+try:
+    import resource  # ausente no Windows: pico de memória fica None
+except ImportError:
+    resource = None
+
+# ==================== ÁRVORE SINTÉTICA ====================
+def generate_tree(root, files=1000, depth=2, fanout=4, min_size=1024, max_size=1024 * 1024,
+                  dup_ratio=0.1, categories=None, seed=42):
+    """Cria em root uma árvore reproduzível (mesma semente = mesma árvore).
+
+    Os tamanhos seguem uma distribuição log-uniforme entre min_size e max_size e as
+    extensões são sorteadas de TIPOS (uma categoria, depois uma extensão dela). Uma fração
+    dup_ratio dos arquivos repete o nome de um arquivo de outra pasta, o que gera colisões
+    de nome no destino do modo B.
+    """
+    rng = random.Random(seed)
+    categories = categories or list(TIPOS)
+    block = rng.randbytes(1024 * 1024)
+
+    dirs = [root]
+    level = [root]
+    for d in range(depth):
+        level = [os.path.join(parent, f"pasta_{d}_{i}") for parent in level for i in range(fanout)]
+        dirs.extend(level)
+    for path in dirs:
+        os.makedirs(path, exist_ok=True)
+
+    names = []
+    total_bytes = 0
+    low, high = max(1, min_size), max(1, min_size, max_size)
+    for i in range(files):
+        folder = rng.choice(dirs)
+        if names and rng.random() < dup_ratio:
+            name = rng.choice(names)
+        else:
+            cat = rng.choice(categories)
+            name = f"arquivo_{i:07d}{rng.choice(TIPOS[cat])}"
+            names.append(name)
+        size = int(low * (high / low) ** rng.random()) if max_size else 0
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            continue  # nome repetido na mesma pasta: só conta a primeira ocorrência
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining > 0:
+                f.write(block[:min(remaining, len(block))])
+                remaining -= len(block)
+        total_bytes += size
+
+    count = sum(len(fs) for _, _, fs in os.walk(root))
+    return {"files": count, "bytes": total_bytes, "dirs": len(dirs), "seed": seed}
+
+# ==================== MEDIÇÃO ====================
+class SyscallCounter:
+    """Conta as operações de sistema de arquivos vistas pelos audit hooks do Python.
+
+    Cobre open, os.* (scandir, listdir, rename, mkdir, remove, link, utime...) e shutil.*;
+    stat/lstat não geram eventos de auditoria e ficam de fora, assim como os processos
+    filhos do pool de hashes. Onde existe /proc/self/io, syscr/syscw somam as leituras e
+    escritas reais do processo.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counts = {}
+        self._lock = threading.Lock()
+        sys.addaudithook(self._hook)  # não pode ser removido: fica desligado fora das fases
+
+    def _hook(self, event, args):
+        if self.enabled and (event == "open" or event.startswith(("os.", "shutil."))):
+            with self._lock:
+                self.counts[event] = self.counts.get(event, 0) + 1
+
+    def start(self):
+        self.counts = {}
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+        return dict(sorted(self.counts.items()))
+
+def proc_io():
+    """Contadores de /proc/self/io (Linux) ou {} se indisponível"""
+    try:
+        with open("/proc/self/io") as f:
+            pairs = (line.split(":") for line in f)
+            return {key: int(value) for key, value in pairs if key in ("syscr", "syscw")}
+    except OSError:
+        return {}
+
+def peak_rss_kb():
+    """Pico de memória do processo até agora, em KB (None sem o módulo resource)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS informa em bytes
+
+def measure(name, counter, func, files, size):
+    """Executa func uma vez e devolve as métricas da fase"""
+    io_before = proc_io()
+    counter.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    syscalls = counter.stop()
+    io_after = proc_io()
+
+    files = result.get("files", files) if isinstance(result, dict) else files
+    metrics = {
+        "phase": name,
+        "seconds": round(elapsed, 6),
+        "files": files,
+        "bytes": size,
+        "files_per_s": round(files / elapsed, 1) if elapsed else None,
+        "mb_per_s": round(size / elapsed / 1024 ** 2, 2) if elapsed else None,
+        "syscalls": syscalls,
+        "syscalls_total": sum(syscalls.values()),
+        "io": {key: io_after[key] - io_before.get(key, 0) for key in io_after},
+        "peak_rss_kb": peak_rss_kb(),
+    }
+    if isinstance(result, dict):
+        metrics.update({key: value for key, value in result.items() if key != "files"})
+    return metrics
+
+# ==================== FASES ====================
+def run_benchmark(args):
+    categories = args.category or list(TIPOS)
+    recurse = args.depth > 0
+    sources_root = tempfile.mkdtemp(prefix="organizepy_bench_", dir=args.workdir)
+    dest_base = args.dest_dir or sources_root
+    tree_options = dict(files=args.files, depth=args.depth, fanout=args.fanout,
+                        min_size=args.min_size, max_size=args.max_size, dup_ratio=args.dup_ratio,
+                        categories=categories, seed=args.seed)
+    counter = SyscallCounter()
+    phases = []
+
+    try:
+        src = os.path.join(sources_root, "origem")
+        tree = generate_tree(src, **tree_options)
+        sources = [("origem", src)]
+        files, size = tree["files"], tree["bytes"]
+
+        def collect():
+            # Caminho antigo: uma caminhada completa por categoria
+            found = sum(len(collect_files_for_patterns(src, TIPOS[cat], recurse)) for cat in categories)
+            return {"files": found, "walks": len(categories)}
+
+        def unique_paths(reserve):
+            # Todos os nomes da árvore numa única pasta: cada repetição é uma colisão
+            # (a pasta fica em sources_root e sai na limpeza final, fora da medição)
+            scratch = tempfile.mkdtemp(prefix="nomes_", dir=sources_root)
+            collisions = 0
+            for _, _, names in os.walk(src):
+                for name in names:
+                    path = reserve(scratch, name)
+                    collisions += os.path.basename(path) != name
+                    open(path, "x").close()
+            return {"collisions": collisions}
+
+        def scan():
+            scanner = SourceScanner(sources, categories, "B", os.path.join(dest_base, "bench_scan"),
+                                    recurse, with_size=True,
+                                    scan_workers=args.scan_workers)
+            found = found_bytes = 0
+            for task in scanner:
+                found += 1
+                found_bytes += task.size or 0
+            return {"files": found, "scanned_bytes": found_bytes}
+
+        def plan():
+            result = plan_organization(sources, categories, "B", dest_base, "bench_plan", recurse,
+                                       scan_workers=args.scan_workers)
+            return {"files": result.total_files}
+
+        def move():
+            # A instrumentação do próprio organize() mostra onde o tempo do movimento foi
+            metrics = RunMetrics()
+            _, moved, _ = organize(sources, categories, args.mode, dest_base, "bench_move", recurse,
+                                   workers=args.workers, journal=not args.no_journal,
+                                   scan_workers=args.scan_workers, metrics=metrics)
+            return {"files": moved, "metrics": metrics.summary()}
+
+        registry = NameRegistry()
+        selected = {
+            "collect": collect,
+            "unique_path": lambda: unique_paths(lambda d, n: make_unique_path(os.path.join(d, n))),
+            "name_registry": lambda: unique_paths(registry.reserve),
+            "scan": scan,
+            "plan": plan,
+            "move": move,
+        }
+        moved = False
+        for name in [name for name in selected if name in (args.phase or selected)]:
+            for run in range(args.repeat):
+                if name == "move" and moved:
+                    # O movimento esvazia a origem: cada repetição recebe a mesma árvore de novo
+                    shutil.rmtree(src)
+                    shutil.rmtree(os.path.join(dest_base, "bench_move"), ignore_errors=True)
+                    generate_tree(src, **tree_options)
+                moved = moved or name == "move"
+                metrics = measure(name, counter, selected[name], files, size)
+                metrics["run"] = run
+                phases.append(metrics)
+                if not args.quiet:
+                    print(f"⏱️ {name} [{run + 1}/{args.repeat}]: {metrics['seconds']:.3f}s, "
+                          f"{metrics['files_per_s']} arquivos/s", file=sys.stderr)
+    finally:
+        if not args.keep:
+            shutil.rmtree(sources_root, ignore_errors=True)
+            if args.dest_dir:
+                for name in ("bench_plan", "bench_move"):
+                    shutil.rmtree(os.path.join(args.dest_dir, name), ignore_errors=True)
+
+    return {
+        "config": {key: value for key, value in vars(args).items()
+                   if key not in ("output", "baseline", "quiet", "keep")},
+        "tree": tree,
+        "platform": {"python": platform.python_version(), "system": platform.platform(),
+                     "cpus": os.cpu_count()},
+        "phases": phases,
+    }
+
+def compare(result, baseline, tolerance):
+    """Linhas de regressão: fases com arquivos/s abaixo do baseline além da tolerância"""
+    best = {}
+    for metrics in baseline.get("phases", []):
+        rate = metrics.get("files_per_s") or 0
+        best[metrics["phase"]] = max(best.get(metrics["phase"], 0), rate)
+
+    regressions = []
+    for phase, reference in best.items():
+        rates = [m["files_per_s"] or 0 for m in result["phases"] if m["phase"] == phase]
+        if rates and reference and max(rates) < reference * (1 - tolerance):
+            regressions.append(f"❌ {phase}: {max(rates):.1f} arquivos/s (baseline {reference:.1f})")
+    return regressions
+
+# ==================== LINHA DE COMANDO ====================
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="organizepy-benchmark",
+        description="Mede varredura, plano e movimento em uma árvore sintética reproduzível.",
+    )
+    parser.add_argument("--files", type=int, default=10000, help="quantidade de arquivos (padrão: 10000)")
+    parser.add_argument("--depth", type=int, default=2,
+                        help="níveis de subpastas; 0 = tudo na raiz, sem recurse (padrão: 2)")
+    parser.add_argument("--fanout", type=int, default=4, help="subpastas por pasta (padrão: 4)")
+    parser.add_argument("--min-size", type=parse_size, default=parse_size("1KB"), metavar="TAMANHO",
+                        help="menor arquivo, ex.: 0, 512, 4KB (padrão: 1KB)")
+    parser.add_argument("--max-size", type=parse_size, default=parse_size("1MB"), metavar="TAMANHO",
+                        help="maior arquivo, distribuição log-uniforme (padrão: 1MB)")
+    parser.add_argument("--dup-ratio", type=float, default=0.1, metavar="FRAÇÃO",
+                        help="fração de arquivos com nome repetido de outra pasta (padrão: 0.1)")
+    parser.add_argument("-c", "--category", action="append", default=[], choices=list(TIPOS),
+                        metavar="CATEGORIA", help="categorias das extensões (pode repetir; padrão: todas)")
+    parser.add_argument("--seed", type=int, default=42, help="semente da árvore (padrão: 42)")
+    parser.add_argument("--phase", action="append",
+                        choices=["collect", "unique_path", "name_registry", "scan", "plan", "move"],
+                        help="fase a medir (pode repetir; padrão: todas)")
+    parser.add_argument("--repeat", type=int, default=1, help="execuções de cada fase (padrão: 1)")
+    parser.add_argument("-m", "--mode", choices=["A", "B"], default="B", type=str.upper,
+                        help="modo da fase de movimento (padrão: B)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="workers fixos do movimento (padrão: ajuste automático)")
+    parser.add_argument("--scan-workers", type=int, default=SCAN_WORKERS, metavar="N",
+                        help=f"threads de varredura (padrão: {SCAN_WORKERS})")
+    parser.add_argument("--no-journal", action="store_true", help="mover sem o diário de movimentos")
+    parser.add_argument("--workdir", default=None, metavar="PASTA",
+                        help="onde criar a árvore (padrão: pasta temporária do sistema)")
+    parser.add_argument("--dest-dir", default=None, metavar="PASTA",
+                        help="destino do plano e do movimento; outro disco mede a cópia (padrão: workdir)")
+    parser.add_argument("-o", "--output", metavar="ARQUIVO", help="gravar o JSON aqui em vez da saída padrão")
+    parser.add_argument("--baseline", metavar="ARQUIVO",
+                        help="JSON de uma execução anterior; sai com código 1 se alguma fase regredir")
+    parser.add_argument("--tolerance", type=float, default=0.1, metavar="FRAÇÃO",
+                        help="queda de arquivos/s aceita em relação ao baseline (padrão: 0.1)")
+    parser.add_argument("--keep", action="store_true", help="não apagar a árvore gerada")
+    parser.add_argument("-q", "--quiet", action="store_true", help="não mostrar o andamento")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    result = run_benchmark(args)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+# ==================== EXECUÇÃO ====================
+if __name__ == "__main__":
+    sys.exit(main())
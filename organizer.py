@@ -0,0 +1,3258 @@
+
+# organizer.py - Motor de organização do OrganizePY (sem dependências de interface)
+import os
+import sys
+import re
+import json
+import multiprocessing
+import hashlib
+import heapq
+import errno
+import fnmatch
+import shutil
+import time
+import queue
+import select
+import stat
+import struct
+import sqlite3
+import tempfile
+import threading
+from array import array
+from collections import deque, namedtuple
+from contextlib import closing, contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+# ==================== TIPOS DE ARQUIVOS - AGORA COM EXTENSÕES INDIVIDUAIS ====================
+TIPOS = {
+    # Documentos
+    "PDF": [".pdf"],
+    "Word": [".doc", ".docx", ".docm"],
+    "Texto": [".txt", ".rtf", ".md"],
+    "Email": [".eml"],
+    
+    # Planilhas
+    "Excel": [".xls", ".xlsx", ".xlsm"],
+    "CSV": [".csv"],
+    "OpenOffice Calc": [".ods"],
+    
+    # Apresentações
+    "PowerPoint": [".ppt", ".pptx", ".pptm"],
+    
+    # Bancos de Dados
+    "Access": [".accdb", ".mdb"],
+    
+    # Imagens
+    "JPEG": [".jpg", ".jpeg"],
+    "PNG": [".png"],
+    "GIF": [".gif"],
+    "BMP": [".bmp"],
+    "WebP": [".webp"],
+    "TIFF": [".tif", ".tiff"],
+    "CorelDRAW": [".cdr"],
+    "Photoshop": [".psd"],
+    
+    # Vídeos
+    "MP4": [".mp4"],
+    "MKV": [".mkv"],
+    "MOV": [".mov"],
+    "AVI": [".avi"],
+    "WMV": [".wmv"],
+    "FLV": [".flv"],
+    
+    # Áudio
+    "MP3": [".mp3"],
+    "WAV": [".wav"],
+    "FLAC": [".flac"],
+    "OGG": [".ogg"],
+    "Opus": [".opus"],
+    "M4A": [".m4a"],
+    
+    # Modelos 3D
+    "STL": [".stl"],
+    "OBJ": [".obj"],
+    "3MF": [".3mf"],
+    "G-Code": [".gcode"],
+    
+    # Web/Código
+    "HTML": [".html", ".htm"],
+    "CSS": [".css"],
+    "JavaScript": [".js"],
+    "JSON": [".json"],
+    "XML": [".xml"],
+    "Python": [".py"],
+    "Java": [".java"],
+    "PHP": [".php"],
+    "Arduino": [".ino"],
+    "PowerShell": [".ps1"],
+    
+    # Compactados
+    "ZIP": [".zip"],
+    "RAR": [".rar"],
+    "7Z": [".7z"],
+    "TAR": [".tar"],
+    "GZ": [".gz"],
+    
+    # Fontes
+    "TrueType": [".ttf"],
+    "OpenType": [".otf"],
+    
+    # Instaladores
+    "Executáveis": [".exe"],
+    "MSI": [".msi"],
+    "Batch": [".bat", ".cmd"],
+    
+    # Office Extra
+    "Publisher": [".pub"],
+    "Visio": [".vsd", ".vsdx"],
+    "OneNote": [".one"]
+}
+
+# ==================== REGRAS DE CLASSIFICAÇÃO ====================
+SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2,
+              "G": 1024 ** 3, "GB": 1024 ** 3, "T": 1024 ** 4, "TB": 1024 ** 4}
+DAY = 86400
+
+Rule = namedtuple("Rule", "category min_size max_size min_age max_age order")
+
+def parse_size(value):
+    """Aceita bytes (número) ou texto como "500KB", "1.5 GB", "4K" """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*([KMGT]?B?)\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"tamanho inválido: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+def _rule_order(rule):
+    return rule.order
+
+def _compiles(pattern):
+    try:
+        re.compile(pattern)
+        return True
+    except re.error:
+        return False
+
+class RuleSet:
+    """Regras de classificação compiladas uma única vez.
+    
+    definitions é uma lista ordenada de (categoria, regra); a regra aceita "extensoes"
+    (inclusive compostas, como ".tar.gz"), "glob" e "regex" (nome inteiro do arquivo) e os
+    predicados "tamanho_min"/"tamanho_max" e "idade_min_dias"/"idade_max_dias". Regras
+    anteriores têm prioridade, seja o casamento por extensão ou por padrão; se os
+    predicados falham a próxima regra é tentada.
+    
+    As extensões viram um único dict sufixo → regras e os padrões uma única regex
+    combinada, então cada arquivo custa uma consulta por sufixo (e uma regex, se houver
+    padrões); stat só é feito para as regras que têm predicados. Cada padrão é validado e
+    confirmado com sua própria regex; os que têm grupos (referências \\1 mudariam de
+    número) ou flags globais como (?i) ficam fora da combinada e são testados à parte.
+    """
+    
+    def __init__(self, definitions, categories=None):
+        self.definitions = definitions
+        selected = set(categories) if categories is not None else None
+        self.names = list(dict.fromkeys(cat for cat, _ in definitions))
+        self.categories = [cat for cat in self.names if selected is None or cat in selected]
+        self._suffixes = {}
+        self._patterns = []
+        known = set()
+        
+        for order, (cat, spec) in enumerate(definitions):
+            rule = Rule(cat, parse_size(spec.get("tamanho_min")), parse_size(spec.get("tamanho_max")),
+                        spec.get("idade_min_dias") and spec["idade_min_dias"] * DAY,
+                        spec.get("idade_max_dias") and spec["idade_max_dias"] * DAY, order)
+            suffixes = [ext.lower() if ext.startswith(".") else "." + ext.lower()
+                        for ext in spec.get("extensoes", [])]
+            known.update(suffixes)
+            if selected is not None and cat not in selected:
+                continue
+            for suffix in suffixes:
+                self._suffixes.setdefault(suffix, []).append(rule)
+            for pattern in spec.get("glob", []):
+                self._patterns.append((f"(?i:{fnmatch.translate(pattern)})", rule))
+            for pattern in spec.get("regex", []):
+                self._patterns.append((pattern, rule))
+        
+        self._known = frozenset(known)
+        self._max_dots = max((suffix.count(".") for suffix in known), default=1)
+        self._compiled = []
+        combined = []
+        self._first_alone = len(self._patterns)  # primeiro padrão fora da regex combinada
+        plain_flags = re.compile("").flags
+        for i, (source, rule) in enumerate(self._patterns):
+            try:
+                pattern = re.compile(source)
+            except re.error as e:
+                raise ValueError(f"padrão inválido nas regras: {source}: {e}") from e
+            self._compiled.append((pattern, rule))
+            wrapped = f"(?P<_r{i}>(?:{source})\\Z)"
+            if pattern.groups == 0 and pattern.flags == plain_flags and _compiles(wrapped):
+                combined.append(wrapped)
+            else:
+                self._first_alone = min(self._first_alone, i)
+        self._combined = re.compile("|".join(combined)) if combined else None
+        self.uses_age = any(rule.min_age or rule.max_age for _, rule in self._patterns) or any(
+            rule.min_age or rule.max_age for rules in self._suffixes.values() for rule in rules)
+    
+    @classmethod
+    def from_tipos(cls, categories=None):
+        return cls([(cat, {"extensoes": exts}) for cat, exts in TIPOS.items()], categories)
+    
+    def select(self, categories):
+        """Mesmas regras, compiladas só para as categorias escolhidas"""
+        return RuleSet(self.definitions, categories)
+    
+    @property
+    def signature(self):
+        """Muda quando as regras ou a seleção mudam (e a cada dia, se houver regra de idade)"""
+        data = [self.definitions, self.categories, time.strftime("%Y-%m-%d") if self.uses_age else None]
+        return hashlib.blake2b(json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8"),
+                               digest_size=16).hexdigest()
+    
+    def _suffixes_of(self, name):
+        """Sufixos do nome, do mais curto ao mais longo, até o maior número de pontos das regras"""
+        lower = name.lower()
+        suffixes = []
+        pos = len(lower)
+        for _ in range(self._max_dots):
+            pos = lower.rfind(".", 0, pos)
+            if pos <= 0:
+                break  # ".bashrc" não tem extensão, como em os.path.splitext
+            suffixes.append(lower[pos:])
+        return suffixes
+    
+    def _check(self, rule, stat_file, cache):
+        if rule.min_size is None and rule.max_size is None and not rule.min_age and not rule.max_age:
+            return True
+        if not cache:
+            try:
+                cache.append(stat_file())
+            except OSError:
+                return False
+        st = cache[0]
+        age = time.time() - st.st_mtime
+        return ((rule.min_size is None or st.st_size >= rule.min_size) and
+                (rule.max_size is None or st.st_size <= rule.max_size) and
+                (not rule.min_age or age >= rule.min_age) and
+                (not rule.max_age or age <= rule.max_age))
+    
+    def _pattern_rules(self, name):
+        """Regras cujos padrões casam com o nome, na ordem de definição (gerador: as regex
+        além da primeira só rodam se os predicados das anteriores falharem)"""
+        first = self._first_alone
+        match = self._combined.match(name) if self._combined is not None else None
+        if match:
+            # Padrões combinados não têm grupos próprios: lastgroup é sempre "_rN"
+            first = min(first, int(match.lastgroup[2:]))
+        for pattern, rule in self._compiled[first:]:
+            if pattern.fullmatch(name):
+                yield rule
+    
+    def classify_name(self, name, stat_file):
+        """Categoria do arquivo (ou None); stat_file() só é chamado se um predicado precisar"""
+        cache = []
+        # Cada lista de sufixo e os padrões já estão na ordem de definição: basta intercalar
+        found = [rules for rules in map(self._suffixes.get, self._suffixes_of(name)) if rules]
+        if len(found) > 1:
+            candidates = heapq.merge(*found, key=_rule_order)
+        else:
+            candidates = found[0] if found else ()
+        if self._compiled:
+            candidates = heapq.merge(self._pattern_rules(name), candidates, key=_rule_order)
+        
+        for rule in candidates:
+            if self._check(rule, stat_file, cache):
+                return rule.category
+        return None
+    
+    def classify(self, entry):
+        """classify_name() para um os.DirEntry"""
+        return self.classify_name(entry.name, lambda: entry.stat(follow_symlinks=False))
+    
+    def needs_sniffing(self, name):
+        """Sem nenhum sufixo conhecido pelas regras: candidato à detecção por conteúdo"""
+        return self._known.isdisjoint(self._suffixes_of(name))
+
+def load_rules(path=None):
+    """Carrega as regras de um JSON; sem path usa só TIPOS.
+    
+    Formato: {"categorias": {"Nome": {"extensoes": [...], "glob": [...], ...}},
+    "usar_tipos_padrao": true}. As categorias do arquivo vêm antes das de TIPOS.
+    """
+    if path is None:
+        return RuleSet.from_tipos()
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    definitions = list(config.get("categorias", {}).items())
+    if config.get("usar_tipos_padrao", True):
+        definitions += [(cat, {"extensoes": exts}) for cat, exts in TIPOS.items()]
+    return RuleSet(definitions)
+
+# ==================== FUNÇÕES UTILITÁRIAS ====================
+def get_desktop():
+    return os.path.join(os.path.expanduser("~"), "Desktop")
+
+def make_unique_path(dest_path):
+    """Versão otimizada com menos chamadas ao sistema"""
+    if not os.path.exists(dest_path):
+        return dest_path
+    base, ext = os.path.splitext(dest_path)
+    i = 1
+    while os.path.exists(f"{base} ({i}){ext}"):
+        i += 1
+    return f"{base} ({i}){ext}"
+
+class NameRegistry:
+    """Reserva nomes únicos por pasta de destino, em tempo constante e entre threads.
+    
+    Cada pasta é listada uma única vez; depois disso as colisões são resolvidas em
+    memória, com um contador por nome base ("foto (1).jpg", "foto (2).jpg", ...).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._taken = {}     # pasta -> nomes ocupados (normcase)
+        self._counters = {}  # (pasta, base, ext) -> próximo sufixo a tentar
+        self.collisions = 0  # nomes que precisaram de sufixo
+    
+    def _names(self, dest_dir):
+        names = self._taken.get(dest_dir)
+        if names is None:
+            try:
+                names = {os.path.normcase(n) for n in os.listdir(dest_dir)}
+            except OSError:
+                names = set()
+            self._taken[dest_dir] = names
+        return names
+    
+    def reserve(self, dest_dir, name):
+        """Retorna um caminho livre em dest_dir e o marca como ocupado"""
+        with self._lock:
+            names = self._names(dest_dir)
+            if os.path.normcase(name) not in names:
+                names.add(os.path.normcase(name))
+                return os.path.join(dest_dir, name)
+            base, ext = os.path.splitext(name)
+            key = (dest_dir, base, ext)
+            i = self._counters.get(key, 1)
+            while True:
+                candidate = f"{base} ({i}){ext}"
+                i += 1
+                if os.path.normcase(candidate) not in names:
+                    break
+            self._counters[key] = i
+            self.collisions += 1
+            names.add(os.path.normcase(candidate))
+            return os.path.join(dest_dir, candidate)
+    
+    def release(self, dest_path):
+        """Libera uma reserva que não chegou a ser usada"""
+        dest_dir, name = os.path.split(dest_path)
+        with self._lock:
+            self._taken.get(dest_dir, set()).discard(os.path.normcase(name))
+
+class DestinationDirs:
+    """Pastas de destino já garantidas, criadas sob demanda e uma única vez cada.
+    
+    ensure() só vai ao disco na primeira vez que uma pasta aparece; depois a resposta vem
+    do conjunto em memória, sem nenhuma consulta por arquivo. Categorias sem arquivos
+    nunca têm a pasta criada.
+    """
+    
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._known = set()  # normcase das pastas que já existem
+    
+    def ensure(self, path):
+        key = os.path.normcase(path)
+        if key in self._known:
+            return
+        with self._lock:
+            if key in self._known:
+                return
+            start = time.perf_counter()
+            os.makedirs(path, exist_ok=True)
+            self._known.add(key)
+        if self.metrics:
+            self.metrics.add_time("makedirs", time.perf_counter() - start)
+            self.metrics.count("makedirs")
+    
+    def forget(self, path):
+        """Esquece uma pasta removida por fora durante a execução"""
+        with self._lock:
+            self._known.discard(os.path.normcase(path))
+
+def _rename_noreplace(src, dst):
+    """Renomeia src para dst sem nunca sobrescrever: FileExistsError se dst já existir.
+    
+    Entre discos diferentes levanta OSError(EXDEV), como os.rename.
+    """
+    if os.name == "nt":
+        os.rename(src, dst)  # no Windows rename já falha se o destino existe
+        return
+    try:
+        # link() é atômico e falha se dst existir; depois basta remover a origem
+        os.link(src, dst, follow_symlinks=False)
+    except OSError as e:
+        if isinstance(e, FileExistsError) or e.errno == errno.EXDEV:
+            raise
+        # Sem hard links (FAT, SMB): reserva exclusiva e substituição no mesmo disco
+        os.close(os.open(dst, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+        try:
+            os.replace(src, dst)
+        except BaseException:
+            os.unlink(dst)
+            raise
+        return
+    os.unlink(src)
+
+def _rename_dir_noreplace(src, dst):
+    """Como _rename_noreplace, para pastas: FileExistsError se dst existir, EXDEV entre discos"""
+    if os.name == "nt":
+        os.rename(src, dst)
+        return
+    os.mkdir(dst)  # reserva exclusiva; o rename substitui uma pasta vazia de forma atômica
+    try:
+        os.rename(src, dst)
+    except BaseException:
+        os.rmdir(dst)
+        raise
+
+class FolderCopy:
+    """Pasta entre discos dividida em cópias de arquivos no pool de cópia.
+    Quando a última cópia termina, as pastas de origem (já vazias) são removidas.
+    Links simbólicos nunca são seguidos: são copiados como links."""
+    
+    def __init__(self, child, target, move_id):
+        self.child = child
+        self.target = target
+        self.move_id = move_id
+        self.dirs = []
+        self.files = []
+        self.file_ids = []
+        self.remaining = 0
+        self.errors = []
+    
+    def expand(self):
+        """Lista a árvore inteira uma vez: pastas a criar e arquivos (com tamanho) a copiar.
+        Falha antes de qualquer cópia se a raiz não for uma pasta de verdade ou se houver
+        itens que não podem ser copiados (sockets, dispositivos...)."""
+        if not stat.S_ISDIR(os.lstat(self.child.source).st_mode):
+            raise NotADirectoryError(errno.ENOTDIR, "não é uma pasta", self.child.source)
+        stack = [(self.child.source, self.target)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            self.dirs.append((src_dir, dst_dir))
+            with os.scandir(src_dir) as it:
+                for entry in it:
+                    dst = os.path.join(dst_dir, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, dst))
+                    elif entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                        st = entry.stat(follow_symlinks=False)
+                        # Par do próprio arquivo: uma montagem dentro da pasta tem outro st_dev
+                        pair = (st.st_dev, self.child.pair[1]) if st.st_dev else self.child.pair
+                        self.files.append((entry.path, dst, entry.is_symlink(), st.st_size, pair))
+                    else:
+                        self.errors.append(f"tipo de arquivo não suportado: {entry.path}")
+        if self.errors:
+            raise OSError(f"{len(self.errors)} itens não suportados ({self.errors[0]})")
+        self.remaining = len(self.files)
+        return sum(size for _, _, _, size, _ in self.files)
+    
+    def create_dirs(self):
+        # A raiz já foi criada de forma exclusiva na reserva do nome
+        for _, dst_dir in self.dirs[1:]:
+            os.makedirs(dst_dir, exist_ok=True)
+    
+    def finish(self):
+        """Copia os metadados das pastas e remove as de origem, das mais fundas para a raiz"""
+        for src_dir, dst_dir in reversed(self.dirs):
+            shutil.copystat(src_dir, dst_dir)
+            os.rmdir(src_dir)
+
+class MoveEngine:
+    """Move arquivos pelo caminho mais rápido de cada par (disco de origem, disco de destino).
+    
+    O primeiro arquivo de cada par descobre se o rename funciona; os seguintes vão direto
+    para a cópia quando não funciona. A cópia usa reflink, os.copy_file_range ou
+    os.sendfile quando o sistema oferece, e blocos grandes em Python como último recurso.
+    on_bytes, se informado, recebe o tamanho de cada bloco copiado (progresso da cópia), e
+    metrics (RunMetrics) a latência de cada movimento e os bytes copiados.
+    """
+    
+    FICLONE = 0x40049409  # ioctl de reflink no Linux (btrfs, xfs)
+    
+    def __init__(self, buffer_size=1024 * 1024, large_buffer_size=16 * 1024 * 1024,
+                 large_file=64 * 1024 * 1024, on_bytes=None, metrics=None):
+        self.buffer_size = buffer_size
+        self.large_buffer_size = large_buffer_size
+        self.large_file = large_file
+        self.on_bytes = on_bytes
+        self.metrics = metrics
+        self._rename_ok = {}    # par -> rename funciona?
+        self._copy_method = {}  # par -> primeiro método de cópia que funcionou
+    
+    def move(self, src, dst, pair=None, is_link=False, started=None):
+        """Move src para dst (que não pode existir). Retorna "rename" ou "copy".
+        started(inode), se informado, é chamado quando uma cópia cria dst, antes dos dados."""
+        if self.metrics is None:
+            return self._move(src, dst, pair, is_link, started)
+        start = time.perf_counter()
+        method = self._move(src, dst, pair, is_link, started)
+        self.metrics.observe(method, time.perf_counter() - start)
+        self.metrics.count("renames" if method == "rename" else "copies")
+        return method
+    
+    def _move(self, src, dst, pair, is_link, started=None):
+        if self._rename_ok.get(pair, True):
+            try:
+                _rename_noreplace(src, dst)
+                if pair is not None:
+                    self._rename_ok[pair] = True
+                return "rename"
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                if pair is not None:
+                    self._rename_ok[pair] = False
+        
+        if is_link:
+            target = os.readlink(src)
+            os.symlink(target, dst)  # falha se dst existir
+        else:
+            self._copy_file(src, dst, pair, started)
+        os.unlink(src)
+        return "copy"
+    
+    def _copy_file(self, src, dst, pair, started=None):
+        with open(src, "rb") as fsrc:
+            fdst = open(dst, "xb")  # exclusivo: FileExistsError se outro processo criou
+            try:
+                if started:
+                    started(os.fstat(fdst.fileno()).st_ino)
+                with fdst:
+                    size = os.fstat(fsrc.fileno()).st_size
+                    self._copy_data(fsrc, fdst, size, pair)
+                    # A origem só é removida se o destino tiver todos os bytes
+                    written = os.fstat(fdst.fileno()).st_size
+                    if written != size:
+                        raise OSError(errno.EIO, f"cópia incompleta: {written} de {size} bytes", src)
+                shutil.copystat(src, dst)
+                if self.metrics:
+                    self.metrics.count("bytes_copied", size)
+            except BaseException:
+                os.unlink(dst)
+                raise
+    
+    def _copy_data(self, fsrc, fdst, size, pair):
+        methods = ("reflink", "copy_file_range", "sendfile", "buffer")
+        known = self._copy_method.get(pair)
+        if known is not None:
+            methods = methods[methods.index(known):]
+        
+        for method in methods:
+            if method == "buffer" or self._try_copy(method, fsrc, fdst, size):
+                if method == "buffer":
+                    self._copy_buffered(fsrc, fdst, size)
+                if pair is not None:
+                    self._copy_method.setdefault(pair, method)
+                return
+    
+    def _try_copy(self, method, fsrc, fdst, size):
+        """Tenta um método acelerado pelo kernel; False se o sistema não suportar"""
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        offset = 0
+        try:
+            if method == "reflink":
+                if sys.platform != "linux":
+                    return False
+                import fcntl
+                fcntl.ioctl(outfd, self.FICLONE, infd)
+                return True
+            
+            func = getattr(os, method, None)
+            if func is None:
+                return False
+            chunk = self.large_buffer_size if size >= self.large_file else self.buffer_size
+            while True:
+                if method == "copy_file_range":
+                    sent = func(infd, outfd, chunk)
+                else:
+                    sent = func(outfd, infd, offset, chunk)
+                if sent == 0:
+                    # Alguns FUSE/compartilhamentos de rede devolvem 0 sem copiar nada
+                    return offset > 0 or size == 0
+                offset += sent
+                if self.on_bytes:
+                    self.on_bytes(sent)
+        except OSError as e:
+            if offset:
+                raise  # falhou no meio da cópia: erro real de E/S
+            if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                           errno.ENOTTY, errno.EBADF, errno.EPERM):
+                return False
+            raise
+    
+    def _copy_buffered(self, fsrc, fdst, size):
+        buf = bytearray(self.large_buffer_size if size >= self.large_file else self.buffer_size)
+        view = memoryview(buf)
+        while True:
+            n = fsrc.readinto(buf)
+            if not n:
+                break
+            fdst.write(view[:n])
+            if self.on_bytes:
+                self.on_bytes(n)
+
+# Um arquivo (ou pasta) a mover. destination fica None até o nome final ser reservado.
+FileTask = namedtuple(
+    "FileTask", "source name dest_dir category kind pair is_link size destination")
+
+def _move_task(task, names, engine, journal=None, move_id=None, dirs=None):
+    """Move uma tarefa para sua pasta de destino já existente (sem stat na origem).
+    Com journal, move_id é a intenção já registrada para task.destination. Com dirs
+    (DestinationDirs), uma pasta de destino apagada por fora é recriada uma vez."""
+    dest_path = task.destination
+    recreated = False
+    while True:
+        if dest_path is None:
+            dest_path = names.reserve(task.dest_dir, task.name)
+            if journal:
+                move_id, = journal.intents([(task.source, dest_path)])
+        try:
+            engine.move(task.source, dest_path, task.pair, task.is_link,
+                        journal.copy_started(move_id) if journal else None)
+            if journal:
+                journal.done(move_id)
+            return dest_path
+        except FileExistsError:
+            # Criado por outro processo depois da listagem: a reserva continua ocupada
+            dest_path = None
+            if journal:
+                journal.abort(move_id)
+        except FileNotFoundError:
+            # Só na falha o disco é consultado: origem sumiu ou a pasta de destino foi apagada
+            if dirs is None or recreated or os.path.isdir(task.dest_dir):
+                names.release(dest_path)
+                if journal:
+                    journal.abort(move_id)
+                raise
+            recreated = True
+            dirs.forget(task.dest_dir)
+            dirs.ensure(task.dest_dir)
+        except BaseException:
+            names.release(dest_path)
+            if journal:
+                journal.abort(move_id)
+            raise
+
+def move_with_rename(src_file, dest_dir, dirs=None):
+    """Versão otimizada com verificações reduzidas (dirs: DestinationDirs compartilhado)"""
+    if dirs is None:
+        os.makedirs(dest_dir, exist_ok=True)
+    else:
+        dirs.ensure(dest_dir)
+    
+    dest_path = make_unique_path(os.path.join(dest_dir, os.path.basename(src_file)))
+    
+    if os.path.abspath(src_file) == os.path.abspath(dest_path):
+        return None
+    
+    shutil.move(src_file, dest_path)
+    return dest_path
+
+def device_of(path):
+    """st_dev do caminho (None se não for possível consultar)"""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+class AdaptiveLimiter:
+    """Janela de concorrência que se ajusta pela vazão e latência medidas (subida de encosta).
+    
+    A cada `sample` movimentos concluídos compara a vazão (arquivos/s) com a janela
+    anterior: se melhorou continua na mesma direção, se piorou inverte. Com a vazão parada
+    e a latência média por movimento subindo, reduz: os workers extras só formam fila no
+    disco. Com minimum == maximum o limite fica fixo.
+    """
+    
+    def __init__(self, initial=4, minimum=1, maximum=32, sample=32):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.sample = sample
+        self.active = 0
+        self.latency = None  # latência média por movimento na última janela (s)
+        self._cond = threading.Condition()
+        self._direction = 1
+        self._count = 0
+        self._elapsed = 0.0
+        self._window_start = time.perf_counter()
+        self._last_rate = None
+    
+    def acquire(self):
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+    
+    def release(self, elapsed=0.0):
+        with self._cond:
+            self.active -= 1
+            self._count += 1
+            self._elapsed += elapsed
+            if self.minimum < self.maximum and self._count >= max(self.sample, 2 * self.limit):
+                self._adjust()
+            self._cond.notify_all()
+    
+    def _adjust(self):
+        now = time.perf_counter()
+        rate = self._count / max(now - self._window_start, 1e-6)
+        latency = self._elapsed / self._count
+        if self._last_rate is not None:
+            if rate < self._last_rate * 0.95:
+                self._direction = -self._direction
+            elif rate < self._last_rate * 1.05 and latency > self.latency * 1.25:
+                self._direction = -1  # mesma vazão, cada movimento mais lento: só fila
+        self.limit = min(max(self.limit + self._direction, self.minimum), self.maximum)
+        if self.limit in (self.minimum, self.maximum):
+            self._direction = 1 if self.limit == self.minimum else -1
+        self._last_rate = rate
+        self.latency = latency
+        self._count = 0
+        self._elapsed = 0.0
+        self._window_start = now
+
+def collect_files_for_patterns(src_path, patterns, recurse=False):
+    """Versão otimizada com set para busca mais rápida"""
+    found = []
+    pattern_set = set(patterns)
+    
+    try:
+        if recurse:
+            for root, _, files in os.walk(src_path):
+                found.extend(
+                    os.path.join(root, f) for f in files 
+                    if os.path.splitext(f)[1].lower() in pattern_set
+                )
+        else:
+            for f in os.listdir(src_path):
+                full_path = os.path.join(src_path, f)
+                if os.path.isfile(full_path) and os.path.splitext(f)[1].lower() in pattern_set:
+                    found.append(full_path)
+    except (FileNotFoundError, PermissionError):
+        pass
+    
+    return found
+
+def scan_directory(current, rules, recurse=False, exclude=None, folders=None, index=None,
+                   unknown=None):
+    """Lista uma única pasta: retorna ([(DirEntry, categoria)], [subpastas a visitar]).
+    
+    exclude já vem normalizado (os.path.normcase + abspath); folders, se for uma lista,
+    recebe as subpastas desta pasta. É a unidade de trabalho da varredura paralela.
+    """
+    found = []
+    descend = []
+    try:
+        subdirs = None
+        if index is not None:
+            st = os.stat(current)
+            subdirs = index.unchanged(current, st)
+        if subdirs is not None:
+            # Nada novo na pasta: só as subpastas conhecidas precisam ser visitadas
+            for name, is_link in subdirs:
+                child = os.path.join(current, name)
+                if folders is not None:
+                    folders.append(IndexedDir(child, name, is_link))
+                if recurse and not is_link:
+                    descend.append(child)
+            return found, descend
+        
+        subdirs = []
+        complete = True
+        with os.scandir(current) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if exclude and os.path.normcase(os.path.abspath(entry.path)) == exclude:
+                            continue
+                        subdirs.append((entry.name, entry.is_symlink()))
+                        if folders is not None:
+                            folders.append(IndexedDir(entry.path, entry.name, entry.is_symlink()))
+                        if recurse and not entry.is_symlink():
+                            descend.append(entry.path)
+                        continue
+                    cat = rules.classify(entry)
+                    if cat is not None:
+                        if entry.is_file():
+                            found.append((entry, cat))
+                    elif unknown is not None and rules.needs_sniffing(entry.name) and entry.is_file():
+                        unknown(entry)
+                except OSError:
+                    # Uma entrada ilegível não derruba o resto da pasta, mas a pasta não entra
+                    # no índice: a entrada é tentada de novo na próxima execução
+                    complete = False
+        if index is not None and complete:
+            index.visit(current, st, subdirs)
+    except OSError:
+        pass
+    return found, descend
+
+class WorkStealingWalker:
+    """Percorre árvores de pastas com várias threads.
+    
+    Cada thread tem sua própria deque: empilha as subpastas que encontra e desempilha do
+    mesmo lado (profundidade primeiro, boa localidade); quando fica sem trabalho rouba a
+    pasta mais antiga de outra thread, que costuma ser a raiz da maior subárvore pendente.
+    visit(item) processa um item e retorna os filhos a visitar.
+    """
+    
+    def __init__(self, workers, visit):
+        self.workers = max(1, workers)
+        self.visit = visit
+        self._deques = [deque() for _ in range(self.workers)]
+        self._cond = threading.Condition()
+        self._outstanding = 0
+        self.errors = []
+    
+    def run(self, roots):
+        """Visita roots e tudo o que delas surgir; retorna quando não restar trabalho"""
+        # Na thread 0 a primeira raiz é a primeira a sair (mesma ordem da varredura serial)
+        self._deques[0].extend(reversed(roots))
+        self._outstanding = len(roots)
+        threads = [threading.Thread(target=self._work, args=(i,), daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def _take(self, index):
+        with self._cond:
+            while True:
+                own = self._deques[index]
+                if own:
+                    return own.pop()
+                for offset in range(1, self.workers):
+                    victim = self._deques[(index + offset) % self.workers]
+                    if victim:
+                        return victim.popleft()
+                if self._outstanding == 0:
+                    return None
+                self._cond.wait()
+    
+    def _work(self, index):
+        while True:
+            item = self._take(index)
+            if item is None:
+                return
+            children = []
+            try:
+                children = self.visit(item) or []
+            except Exception as e:
+                self.errors.append(e)
+            with self._cond:
+                self._deques[index].extend(children)
+                self._outstanding += len(children) - 1
+                if self._outstanding == 0:
+                    self._cond.notify_all()  # acabou: libera todas as threads ociosas
+                elif children:
+                    self._cond.notify(len(children))
+
+# ==================== EXECUÇÃO EM LOTES (CPU) ====================
+CPU_EXECUTORS = ("process", "thread", "serial")
+CPU_BATCH = 256      # itens por envio ao pool: um pickle por lote, não por arquivo
+POOL_MIN_ITEMS = 32  # abaixo disso não compensa usar o pool
+
+def _apply_batch(function, items):
+    """Roda no worker: aplica function a cada item do lote e devolve a lista inteira"""
+    return [function(item) for item in items]
+
+def _process_context():
+    """forkserver (ou spawn, onde não existe): o pool sobe com outras threads já rodando
+    (varredura, movimentos, watcher) e um fork no meio delas pode herdar locks presos"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+class BatchExecutor:
+    """Camada de execução para as etapas por arquivo limitadas por CPU (hashes, detecção).
+    
+    kind "process" usa um ProcessPoolExecutor (contorna o GIL), "thread" um
+    ThreadPoolExecutor e "serial" roda na própria thread. O pool só sobe no primeiro
+    envio que precisa dele: enquanto não existe, lotes com menos de POOL_MIN_ITEMS rodam
+    na própria thread. submit() manda um lote inteiro de uma vez (caminhos e resultados em
+    tipos simples) e map() divide uma lista em lotes e devolve os resultados na ordem. Os
+    movimentos, que são só E/S, continuam nos pools de threads de organize().
+    """
+    
+    def __init__(self, kind="process", workers=None, batch_size=CPU_BATCH):
+        if kind not in CPU_EXECUTORS:
+            raise ValueError(f"executor inválido: {kind}")
+        self.kind = "serial" if workers == 1 else kind
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_process_context())
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            return self._pool
+    
+    def submit(self, function, items):
+        """Future com [function(item) for item in items], calculado em um worker (ou aqui,
+        se o lote for pequeno demais para justificar subir o pool)"""
+        if self.kind == "serial" or (self._pool is None and len(items) < POOL_MIN_ITEMS):
+            future = Future()
+            try:
+                future.set_result(_apply_batch(function, items))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._executor().submit(_apply_batch, function, items)
+    
+    def map(self, function, items, batch_size=None):
+        """Resultados na ordem de items; listas pequenas rodam direto, sem pool"""
+        items = list(items)
+        if len(items) < POOL_MIN_ITEMS or self.kind == "serial":
+            return [function(item) for item in items]
+        size = batch_size or max(1, min(self.batch_size, len(items) // (4 * self.workers)))
+        self._executor()  # lotes pequenos (batch_size=1) também vão para o pool
+        futures = [self.submit(function, items[i:i + size]) for i in range(0, len(items), size)]
+        return [result for future in futures for result in future.result()]
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+
+# ==================== DETECÇÃO POR CONTEÚDO ====================
+SNIFF_BYTES = 4096  # uma única leitura do cabeçalho (um bloco, mesmo em compartilhamentos de rede)
+
+def _sniff_zip(header):
+    """ZIP e formatos baseados nele (OOXML, OpenDocument, 3MF) pelos nomes das entradas"""
+    if header[30:38] == b"mimetype" and b"opendocument.spreadsheet" in header[38:120]:
+        return "OpenOffice Calc"
+    for marker, cat in ((b"word/", "Word"), (b"xl/", "Excel"), (b"ppt/", "PowerPoint"),
+                        (b"visio/", "Visio"), (b"3D/3dmodel", "3MF")):
+        if marker in header:
+            return cat
+    return "ZIP"
+
+def _sniff_riff(header):
+    return {b"WAVE": "WAV", b"AVI ": "AVI", b"WEBP": "WebP"}.get(header[8:12])
+
+def _sniff_ftyp(header):
+    brand = header[8:12]
+    if brand == b"qt  ":
+        return "MOV"
+    if brand in (b"M4A ", b"M4B "):
+        return "M4A"
+    return "MP4"
+
+def _sniff_ogg(header):
+    return "Opus" if b"OpusHead" in header[:64] else "OGG"
+
+def _sniff_text(header):
+    start = header.lstrip(b"\xef\xbb\xbf \t\r\n")[:64].lower()
+    if start.startswith((b"<!doctype html", b"<html")):
+        return "HTML"
+    if start.startswith(b"<?xml"):
+        return "XML"
+    if start.startswith(b"{\\rtf"):
+        return "Texto"
+    if start.startswith(b"#!") and b"python" in start.split(b"\n", 1)[0]:
+        return "Python"
+    return None
+
+# (deslocamento, assinatura, categoria ou função que decide olhando o cabeçalho)
+SIGNATURES = [
+    (0, b"%PDF-", "PDF"),
+    (0, b"PK\x03\x04", _sniff_zip),
+    (0, b"\x89PNG\r\n\x1a\n", "PNG"),
+    (0, b"\xff\xd8\xff", "JPEG"),
+    (0, b"GIF87a", "GIF"),
+    (0, b"GIF89a", "GIF"),
+    (0, b"BM", "BMP"),
+    (0, b"II*\x00", "TIFF"),
+    (0, b"MM\x00*", "TIFF"),
+    (0, b"8BPS", "Photoshop"),
+    (0, b"RIFF", _sniff_riff),
+    (4, b"ftyp", _sniff_ftyp),
+    (0, b"\x1a\x45\xdf\xa3", "MKV"),
+    (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", "WMV"),
+    (0, b"FLV\x01", "FLV"),
+    (0, b"ID3", "MP3"),
+    (0, b"\xff\xfb", "MP3"),
+    (0, b"\xff\xf3", "MP3"),
+    (0, b"fLaC", "FLAC"),
+    (0, b"OggS", _sniff_ogg),
+    (0, b"Rar!\x1a\x07", "RAR"),
+    (0, b"7z\xbc\xaf\x27\x1c", "7Z"),
+    (0, b"\x1f\x8b", "GZ"),
+    (257, b"ustar", "TAR"),
+    (0, b"\x00\x01\x00\x00\x00", "TrueType"),
+    (0, b"OTTO", "OpenType"),
+    (0, b"MZ", "Executáveis"),
+    (4, b"Standard Jet DB", "Access"),
+    (4, b"Standard ACE DB", "Access"),
+    (0, b"\xe4\x52\x5c\x7b\x8c\xd8\xa7\x4d", "OneNote"),
+]
+
+def compile_signatures(signatures):
+    """Agrupa as assinaturas por (deslocamento, tamanho): cada grupo é um único dict lookup.
+    Grupos mais longos vêm primeiro para que "GIF89a" ganhe de prefixos curtos como "BM"."""
+    groups = {}
+    for offset, magic, result in signatures:
+        groups.setdefault((offset, len(magic)), {})[magic] = result
+    return [(offset, offset + length, table)
+            for (offset, length), table in sorted(groups.items(), key=lambda g: -g[0][1])]
+
+_SIGNATURE_TABLE = compile_signatures(SIGNATURES)
+_sniff_cache = {}
+_sniff_lock = threading.Lock()
+_SNIFF_MISS = object()
+
+def classify_header(header):
+    """Categoria de TIPOS para o cabeçalho (ou None)"""
+    for start, end, table in _SIGNATURE_TABLE:
+        result = table.get(header[start:end])
+        if result is not None:
+            return result(header) if callable(result) else result
+    return _sniff_text(header)
+
+def _read_header(path):
+    """Os primeiros SNIFF_BYTES bytes do arquivo (None se não puder ser lido)"""
+    try:
+        with open(path, "rb", buffering=0) as f:
+            return f.read(SNIFF_BYTES)
+    except OSError:
+        return None
+
+def _sniff_file(path):
+    """(categoria, tamanho) de um arquivo regular pelo cabeçalho, ou (None, None).
+    Roda nos workers do BatchExecutor: recebe e devolve só tipos simples."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None, None
+    if not stat.S_ISREG(st.st_mode):
+        return None, None
+    header = _read_header(path)
+    return (classify_header(header) if header is not None else None), st.st_size
+
+def _sniff_key(st):
+    """Chave do cache (dispositivo, inode, mtime, tamanho); None se o stat não traz o inode
+    (DirEntry.stat() no Windows), porque arquivos diferentes teriam a mesma chave"""
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size) if st.st_ino else None
+
+def _cached_sniff(key):
+    """Categoria já detectada para key (pode ser None) ou _SNIFF_MISS"""
+    if key is None:
+        return _SNIFF_MISS
+    with _sniff_lock:
+        return _sniff_cache.get(key, _SNIFF_MISS)
+
+def _remember_sniff(key, cat):
+    if key is not None:
+        with _sniff_lock:
+            _sniff_cache[key] = cat
+
+def sniff_category(path, st=None):
+    """Categoria pelo conteúdo, lendo só os primeiros SNIFF_BYTES bytes.
+    Com st (stat do arquivo) o resultado fica em cache por (dispositivo, inode, mtime, tamanho)."""
+    key = _sniff_key(st) if st is not None else None
+    cat = _cached_sniff(key)
+    if cat is not _SNIFF_MISS:
+        return cat
+    header = _read_header(path)
+    if header is None:
+        return None
+    cat = classify_header(header)
+    _remember_sniff(key, cat)
+    return cat
+
+# ==================== ÍNDICE DE VARREDURA ====================
+IndexedDir = namedtuple("IndexedDir", "path name is_link")
+
+class ScanIndex:
+    """Índice persistente das pastas de origem (SQLite em root_dest/.organizepy).
+    
+    Guarda, por pasta, mtime/inode e as subpastas vistas na última execução, junto com a
+    assinatura das categorias selecionadas. Uma pasta que não mudou desde então não é
+    listada de novo: só as subpastas registradas são visitadas. commit() grava o estado
+    das pastas depois da execução, menos as marcadas com invalidate() (arquivos que
+    falharam ou ficaram na origem precisam ser vistos de novo na próxima execução).
+    """
+    RACY_SECONDS = 2  # mtime recente demais pode esconder outra alteração no mesmo tique
+    
+    def __init__(self, root_dest, signature):
+        self.path = os.path.join(root_dest, JOURNAL_DIR, "scan_index.sqlite3")
+        self.signature = signature
+        self.visited = {}
+        self.skipped = 0
+        self._dirty = set()
+        self._rows = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with closing(self._connect()) as conn:
+                for path, mtime, inode, signature, subdirs in conn.execute("SELECT * FROM dirs"):
+                    if signature == self.signature:
+                        self._rows[path] = (mtime, inode, subdirs)
+    
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime INTEGER, "
+                     "inode INTEGER, signature TEXT, subdirs TEXT)")
+        return conn
+    
+    @staticmethod
+    def signature_of(rules, sniff=False):
+        """Assinatura das regras/categorias: muda se a seleção (ou a detecção) mudar"""
+        return f"{rules.signature}:{int(sniff)}"
+    
+    def unchanged(self, path, st):
+        """Subpastas registradas [(nome, é_link)] se a pasta não mudou; senão None"""
+        row = self._rows.get(path)
+        if row is None or row[0] != st.st_mtime_ns or row[1] != st.st_ino:
+            return None
+        with self._lock:
+            self.skipped += 1
+        return json.loads(row[2])
+    
+    def visit(self, path, st, subdirs):
+        self.visited[path] = (st, subdirs)
+    
+    def invalidate(self, path):
+        """Pasta com uma tarefa que falhou ou não foi processada: não entra no índice"""
+        with self._lock:
+            self._dirty.add(path)
+    
+    def commit(self):
+        """Grava as pastas listadas nesta execução que continuam como estavam na listagem"""
+        limit = (time.time() - self.RACY_SECONDS) * 1e9
+        rows, gone = [], []
+        for path, (st, subdirs) in self.visited.items():
+            if path in self._dirty:
+                gone.append((path,))
+                continue
+            try:
+                now = os.stat(path)
+            except OSError:
+                gone.append((path,))
+                continue
+            # Pastas alteradas pelos movimentos entram no índice na próxima execução
+            if now.st_mtime_ns == st.st_mtime_ns and now.st_ino == st.st_ino \
+                    and st.st_mtime_ns < limit:
+                rows.append((path, st.st_mtime_ns, st.st_ino, self.signature, json.dumps(subdirs)))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM dirs WHERE path = ?", gone)
+            conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+# ==================== CANAL DE PROGRESSO ====================
+class ProgressChannel:
+    """Progresso compartilhado entre os workers e a interface.
+    
+    report() só atualiza contadores e a mensagem de status, log() acrescenta a linha a um
+    anel limitado, ambos sob lock; a interface chama drain() no seu próprio ritmo e
+    recebe tudo de uma vez.
+    """
+    
+    def __init__(self, max_lines=20000):
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_lines)
+        self._dropped = 0
+        self.current = 0
+        self.total = 0
+        self.message = ""
+    
+    def report(self, current, total, message):
+        """Compatível com progress_callback de organize()"""
+        with self._lock:
+            self.current, self.total, self.message = current, total, message
+    
+    def log(self, line):
+        """Compatível com log_callback de organize()"""
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+    
+    def drain(self):
+        """Retorna (atual, total, mensagem, linhas novas, linhas descartadas)"""
+        with self._lock:
+            lines = list(self._lines)
+            dropped = self._dropped
+            self._lines.clear()
+            self._dropped = 0
+            return self.current, self.total, self.message, lines, dropped
+
+class ByteProgress:
+    """Progresso ponderado por bytes, com vazão móvel por caminho e estimativa de término.
+    
+    add() conta cada tarefa encontrada na varredura (com o tamanho já conhecido) e done()
+    cada tarefa concluída, com ou sem erro, na própria thread que fez o movimento; pastas
+    movidas de uma vez (folder=True) entram no total, mas não como arquivos da categoria. Durante
+    uma cópia longa transferred() recebe os blocos do MoveEngine (on_bytes), então um
+    arquivo enorme avança a barra e a vazão antes de terminar.
+    
+    A vazão de cada caminho ("rename" e "copy") é medida numa janela móvel de `window`
+    segundos: renomear custa por arquivo, copiar por byte, e os dois pools rodam ao mesmo
+    tempo, então o ETA é o do caminho mais demorado.
+    """
+    
+    KINDS = ("rename", "copy")
+    
+    def __init__(self, window=10.0):
+        self.window = window
+        self._lock = threading.Lock()
+        self._local = threading.local()  # bytes já informados pela cópia em andamento
+        self.scanning = True
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_files = 0
+        self.done_bytes = 0
+        self.partial_bytes = 0
+        # categoria -> [arquivos, bytes, arquivos prontos, bytes prontos, pastas, pastas prontas]
+        self.categories = {}
+        self._pending = {kind: [0, 0] for kind in self.KINDS}  # [arquivos, bytes] por caminho
+        self._samples = {kind: deque() for kind in self.KINDS}  # (instante, arquivos, bytes)
+        self._window = {kind: [0, 0] for kind in self.KINDS}
+        self._started = {}
+    
+    def add(self, category, kind, size, folder=False):
+        size = size or 0
+        with self._lock:
+            self.total_files += 1
+            self.total_bytes += size
+            counts = self.categories.setdefault(category, [0, 0, 0, 0, 0, 0])
+            if folder:
+                counts[4] += 1
+            else:
+                counts[0] += 1
+                counts[1] += size
+            pending = self._pending[kind]
+            pending[0] += 1
+            pending[1] += size
+    
+    def start(self, kind):
+        """Marca o início do trabalho no caminho (a vazão é medida a partir daqui)"""
+        with self._lock:
+            self._started.setdefault(kind, time.monotonic())
+    
+    def transferred(self, size):
+        """Compatível com on_bytes do MoveEngine: um bloco copiado"""
+        self._local.streamed = getattr(self._local, "streamed", 0) + size
+        with self._lock:
+            self.partial_bytes += size
+            self._sample("copy", 0, size)
+    
+    def done(self, category, kind, size, failed=False, folder=False):
+        size = size or 0
+        streamed = getattr(self._local, "streamed", 0)
+        self._local.streamed = 0
+        with self._lock:
+            self.done_files += 1
+            self.done_bytes += size
+            self.partial_bytes -= streamed
+            counts = self.categories.setdefault(category, [0, 0, 0, 0, 0, 0])
+            if folder:
+                counts[5] += 1
+            else:
+                counts[2] += 1
+                counts[3] += size
+            pending = self._pending[kind]
+            pending[0] -= 1
+            pending[1] -= size
+            # Uma falha não conta como vazão; o que já foi copiado em blocos também não de novo
+            self._sample(kind, 1, 0 if failed else max(0, size - streamed))
+    
+    def _sample(self, kind, files, size):
+        now = time.monotonic()
+        self._samples[kind].append((now, files, size))
+        self._window[kind][0] += files
+        self._window[kind][1] += size
+        self._started.setdefault(kind, now)
+        self._prune(kind, now)
+    
+    def _prune(self, kind, now):
+        samples = self._samples[kind]
+        window = self._window[kind]
+        while samples and samples[0][0] < now - self.window:
+            _, files, size = samples.popleft()
+            window[0] -= files
+            window[1] -= size
+    
+    def _rate(self, kind, now):
+        self._prune(kind, now)
+        if not self._samples[kind]:
+            return 0.0, 0.0
+        span = max(now - max(self._started[kind], now - self.window), 1e-3)
+        files, size = self._window[kind]
+        return files / span, size / span
+    
+    def finish_scan(self):
+        with self._lock:
+            self.scanning = False
+    
+    def position(self):
+        """(atual, total) em bytes; em arquivos quando nada tem tamanho"""
+        with self._lock:
+            if self.total_bytes:
+                return min(self.done_bytes + self.partial_bytes, self.total_bytes), self.total_bytes
+            return self.done_files, max(1, self.total_files)
+    
+    def rates(self):
+        """{caminho: (arquivos/s, bytes/s)} na janela móvel"""
+        now = time.monotonic()
+        with self._lock:
+            return {kind: self._rate(kind, now) for kind in self.KINDS}
+    
+    def eta(self):
+        """Segundos restantes pela vazão medida (None durante a varredura ou sem medida)"""
+        now = time.monotonic()
+        with self._lock:
+            if self.scanning:
+                return None
+            remaining = 0.0
+            for kind in self.KINDS:
+                files, size = self._pending[kind]
+                if files <= 0:
+                    continue
+                file_rate, byte_rate = self._rate(kind, now)
+                if kind == "copy" and size > 0:
+                    if not byte_rate:
+                        return None
+                    remaining = max(remaining, max(0, size - self.partial_bytes) / byte_rate)
+                else:
+                    if not file_rate:
+                        return None
+                    remaining = max(remaining, files / file_rate)
+            return remaining
+    
+    def status(self):
+        """Resumo de uma linha: porcentagem, vazão e ETA"""
+        current, total = self.position()
+        parts = [f"{100 * current / total:.0f}%"]
+        rates = self.rates()
+        if rates["rename"][0]:
+            parts.append(f"{rates['rename'][0]:.0f} arq/s")
+        if rates["copy"][1]:
+            parts.append(f"{format_size(rates['copy'][1])}/s")
+        eta = self.eta()
+        if eta is not None:
+            parts.append(f"ETA {format_eta(eta)}")
+        return " · ".join(parts)
+    
+    def breakdown(self):
+        """Uma linha por categoria (maiores primeiro): arquivos e bytes concluídos, e as
+        pastas movidas inteiras contadas à parte"""
+        with self._lock:
+            items = sorted(([cat] + counts for cat, counts in self.categories.items()),
+                           key=lambda item: -item[2])
+        lines = []
+        for cat, files, size, done_files, done_bytes, folders, done_folders in items:
+            parts = [f"{done_folders}/{folders} pastas"] if folders else []
+            if files or not folders:
+                parts.append(f"{done_files}/{files} arquivos, {format_size(done_bytes)} de {format_size(size)}")
+            lines.append(f"📁 {cat}: {', '.join(parts)}")
+        return lines
+
+def format_eta(seconds):
+    """Segundos para H:MM:SS (ou M:SS)"""
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class LogStore:
+    """Linhas do log guardadas em um arquivo temporário; na memória ficam só os índices.
+    
+    Mantém o deslocamento de cada linha e um índice por status (✅/⭕/❌/📂), então contar
+    ou ler uma janela de linhas, filtrada ou não, não depende do tamanho do log.
+    """
+    
+    STATUSES = ("✅", "⭕", "❌", "📂")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file = tempfile.TemporaryFile()
+        self._offsets = array("Q")
+        self._by_status = {status: array("Q") for status in self.STATUSES}
+        self._end = 0
+    
+    def append(self, lines):
+        chunks = []
+        with self._lock:
+            for line in lines:
+                data = line.encode("utf-8", "replace") + b"\n"
+                index = len(self._offsets)
+                self._offsets.append(self._end)
+                status = self._by_status.get(line[:1])
+                if status is not None:
+                    status.append(index)
+                self._end += len(data)
+                chunks.append(data)
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(b"".join(chunks))
+    
+    def count(self, status=None):
+        with self._lock:
+            return len(self._offsets) if status is None else len(self._by_status[status])
+    
+    def lines(self, start, count, status=None):
+        """Lê até `count` linhas a partir da posição `start` (na visão filtrada, se houver)"""
+        with self._lock:
+            if status is None:
+                stop = min(start + count, len(self._offsets))
+                if start >= stop:
+                    return []
+                end = self._offsets[stop] if stop < len(self._offsets) else self._end
+                self._file.seek(self._offsets[start])
+                data = self._file.read(end - self._offsets[start])
+                return data.decode("utf-8", "replace").splitlines()
+            
+            result = []
+            for index in self._by_status[status][start:start + count]:
+                self._file.seek(self._offsets[index])
+                result.append(self._file.readline().decode("utf-8", "replace").rstrip("\n"))
+            return result
+    
+    def clear(self):
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+            self._offsets = array("Q")
+            self._by_status = {status: array("Q") for status in self.STATUSES}
+            self._end = 0
+
+class LogWriter:
+    """Grava o log em segundo plano, em lotes, à medida que a execução avança.
+    
+    As linhas vão para uma fila; uma thread as escreve quando o lote passa de
+    flush_bytes ou quando flush_interval segundos se passam desde a última gravação.
+    Assim o log em disco acompanha a execução e sobrevive a uma interrupção.
+    """
+    
+    def __init__(self, path, flush_bytes=64 * 1024, flush_interval=1.0):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._file = open(path, "a", encoding="utf-8")
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def write(self, line):
+        self._queue.put(line)
+    
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+    
+    def _run(self):
+        buffer = []
+        size = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                if buffer:
+                    wait = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+                    line = self._queue.get(timeout=wait)
+                else:
+                    line = self._queue.get()  # sem nada pendente: espera sem consumir CPU
+            except queue.Empty:
+                line = ""
+            
+            if line is None:
+                self._flush(buffer)
+                return
+            if line:
+                buffer.append(line + "\n")
+                size += len(buffer[-1])
+            if size >= self.flush_bytes or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush(buffer)
+                size = 0
+                last_flush = time.monotonic()
+    
+    def _flush(self, buffer):
+        if buffer:
+            self._file.write("".join(buffer))
+            self._file.flush()
+            buffer.clear()
+
+def iter_log_records(path):
+    """Lê um log estruturado (JSON Lines) registro a registro, sem carregar o arquivo todo"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # última linha incompleta de uma execução interrompida
+
+# ==================== MÉTRICAS DE EXECUÇÃO ====================
+class LatencyHistogram:
+    """Histograma de latências em baldes de potência de 2 (microssegundos).
+    
+    Memória constante por caminho; os percentis saem como o limite superior do balde,
+    o que basta para distinguir 0,1 ms de 10 ms ou de 1 s.
+    """
+    
+    def __init__(self):
+        self.buckets = [0] * 40
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds):
+        self.buckets[min(int(seconds * 1e6).bit_length(), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def percentile(self, fraction):
+        """Limite superior (s) do balde que contém o percentil"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+    
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": self.total / self.count, "p50": self.percentile(0.5),
+                "p95": self.percentile(0.95), "p99": self.percentile(0.99), "max": self.max}
+
+class RunMetrics:
+    """Instrumentação de uma execução: tempos por fase, contadores e latência por caminho.
+    
+    phase() soma o tempo de um trecho (fases que se repetem ou rodam em várias threads
+    acumulam), count() incrementa um contador e observe() registra a latência de um
+    movimento no histograma do caminho ("rename", "copy", "folder"...). Tudo sob um lock.
+    
+    observer, se informado, é chamado como observer(evento, nome, valor) com os eventos
+    "phase" (segundos, ao fim de cada trecho), "latency" (segundos, a cada movimento) e
+    "summary" (o dicionário de summary(), ao fim da execução).
+    """
+    
+    def __init__(self, observer=None):
+        self.observer = observer
+        self.phases = {}
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+    
+    def add_time(self, name, seconds):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if self.observer:
+            self.observer("phase", name, seconds)
+    
+    def timed(self, name, func):
+        """Envolve func para somar o tempo de cada chamada na fase name"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add_time(name, time.perf_counter() - start)
+        return wrapper
+    
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def observe(self, path, seconds):
+        with self._lock:
+            histogram = self.histograms.get(path)
+            if histogram is None:
+                histogram = self.histograms[path] = LatencyHistogram()
+            histogram.add(seconds)
+        if self.observer:
+            self.observer("latency", path, seconds)
+    
+    def summary(self):
+        """Dicionário serializável em JSON com fases, contadores e latências"""
+        with self._lock:
+            return {
+                "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+                "counters": dict(self.counters),
+                "latency": {path: {key: round(value, 6) if isinstance(value, float) else value
+                                   for key, value in histogram.summary().items()}
+                            for path, histogram in self.histograms.items()},
+            }
+    
+    def summary_lines(self):
+        """O resumo em linhas de log (📈)"""
+        data = self.summary()
+        lines = ["📈 Fases: " + " · ".join(f"{name} {seconds:.3f}s"
+                                          for name, seconds in data["phases"].items())]
+        counters = [f"{name}={format_size(value) if name.startswith('bytes') else value}"
+                    for name, value in sorted(data["counters"].items())]
+        if counters:
+            lines.append("📈 Contadores: " + " ".join(counters))
+        for path, hist in sorted(data["latency"].items()):
+            if hist["count"]:
+                lines.append(f"📈 Latência {path}: {hist['count']} movimentos, média "
+                             f"{hist['mean'] * 1e3:.2f} ms, p50 ≤{hist['p50'] * 1e3:.2f} ms, "
+                             f"p95 ≤{hist['p95'] * 1e3:.2f} ms, p99 ≤{hist['p99'] * 1e3:.2f} ms, "
+                             f"máx {hist['max'] * 1e3:.2f} ms")
+        return lines
+    
+    def finish(self):
+        """Entrega o resumo ao observer e o retorna"""
+        data = self.summary()
+        if self.observer:
+            self.observer("summary", None, data)
+        return data
+
+# ==================== VARREDURA E PLANEJAMENTO ====================
+def category_folder(cat):
+    """Nome da pasta de destino de uma categoria"""
+    return cat.replace("/", "_").replace(" ", "_")
+
+def nearest_device(path):
+    """st_dev do caminho ou do ancestral mais próximo que já existe"""
+    while True:
+        dev = device_of(path)
+        parent = os.path.dirname(path)
+        if dev is not None or parent == path:
+            return dev
+        path = parent
+
+SCAN_WORKERS = 4
+SCAN_QUEUE_SIZE = 4096
+_SCAN_DONE = object()
+
+class SourceContext:
+    """Estado de uma origem durante a varredura paralela"""
+    def __init__(self, label, path):
+        self.label = label
+        self.path = path
+        self.pending = 1
+        self.folders = []
+        self.pair = None
+        self.kind = None
+        self.cat_dests = {}
+        self.dest_folders = None
+
+class SourceScanner:
+    """Varredura única das origens, usada tanto pela execução quanto pelo planejamento.
+    
+    Iterar gera um FileTask por arquivo reconhecido; as subpastas diretas de cada origem
+    ficam em `folders` (também como FileTask, destino "Pastas"; links simbólicos para
+    pastas têm is_link e são movidos como links) e as origens inexistentes
+    em `missing`. Nada é criado no disco: as pastas de destino são criadas sob demanda
+    na execução (DestinationDirs). Com incremental=True as pastas inalteradas desde a
+    última execução são puladas (ScanIndex em `index`).
+    
+    Com sniff=True arquivos sem extensão conhecida são classificados pelo cabeçalho em
+    lotes de caminhos no cpu_executor (BatchExecutor; por padrão um pool de processos
+    próprio), sem atrasar os arquivos já reconhecidos.
+    rules (RuleSet de load_rules) substitui a classificação padrão por TIPOS.
+    
+    As origens (e, nas árvores profundas, as subpastas) são listadas em paralelo por
+    scan_workers threads com um WorkStealingWalker; a ordem das tarefas não é garantida.
+    metrics (RunMetrics) recebe as pastas listadas e os stat feitos.
+    """
+    
+    def __init__(self, sources, categories, mode, root_dest, recurse, with_size=False,
+                 on_missing=None, on_source_done=None, incremental=False, sniff=False,
+                 rules=None, scan_workers=SCAN_WORKERS, metrics=None, cpu_executor=None):
+        self.sources = sources
+        self.categories = categories
+        self.mode = mode
+        self.root_dest = root_dest
+        self.recurse = recurse
+        self.with_size = with_size
+        self.on_missing = on_missing
+        self.on_source_done = on_source_done
+        self.sniff = sniff
+        self.scan_workers = scan_workers
+        self.metrics = metrics
+        self.cpu_executor = cpu_executor
+        self.rules = (rules or RuleSet.from_tipos()).select(categories)
+        self.index = (ScanIndex(root_dest, ScanIndex.signature_of(self.rules, sniff))
+                      if incremental else None)
+        self.dest_dev = nearest_device(root_dest)
+        self.folders = []
+        self.missing = []
+    
+    def origin_root(self, label):
+        return os.path.join(self.root_dest, label) if self.mode.upper() == "A" else self.root_dest
+    
+    def __iter__(self):
+        contexts = []
+        for label, path in self.sources:
+            if not os.path.exists(path):
+                self.missing.append(path)
+                if self.on_missing:
+                    self.on_missing(path)
+                continue
+            contexts.append(self._prepare(label, path))
+        if not contexts:
+            return
+        
+        results = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+        closed = threading.Event()
+        lock = threading.Lock()
+        cpu = (self.cpu_executor or BatchExecutor()) if self.sniff else None
+        own_cpu = cpu is not None and self.cpu_executor is None
+        sniff_batch = []      # (contexto, caminho, nome, chave do cache) esperando um lote
+        sniff_pending = [0]   # lotes enviados cujos resultados ainda não foram emitidos
+        sniff_errors = []
+        sniff_idle = threading.Condition(lock)
+        exclude = os.path.normcase(os.path.abspath(self.root_dest))
+        
+        def emit(item):
+            # Fila limitada: se o consumidor parou (closed) as threads não ficam presas
+            while not closed.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+        
+        def sniffed(batch, future):
+            try:
+                for (ctx, path, name, key, pair, kind), (cat, size) in zip(batch, future.result()):
+                    if key is not None and size == key[3]:
+                        _remember_sniff(key, cat)
+                    if cat in ctx.cat_dests:
+                        emit(FileTask(path, name, ctx.cat_dests[cat], cat, kind, pair,
+                                      False, size if self.with_size else None, None))
+                if self.metrics:
+                    self.metrics.count("sniffed", len(batch))
+                    self.metrics.count("sniff_batches")
+            except BaseException as e:  # pool quebrado ou lote cancelado no encerramento
+                sniff_errors.append(e)
+            finally:
+                with sniff_idle:
+                    sniff_pending[0] -= 1
+                    sniff_idle.notify_all()
+        
+        def flush_sniff(force=False):
+            """Envia os caminhos acumulados em lotes de cpu.batch_size (o resto só com force)"""
+            while True:
+                with lock:
+                    if not sniff_batch or (len(sniff_batch) < cpu.batch_size and not force):
+                        return
+                    batch = sniff_batch[:cpu.batch_size]
+                    del sniff_batch[:cpu.batch_size]
+                    sniff_pending[0] += 1
+                try:
+                    future = cpu.submit(_sniff_file, [item[1] for item in batch])
+                except Exception as e:
+                    future = Future()
+                    future.set_exception(e)
+                future.add_done_callback(lambda fut, batch=batch: sniffed(batch, fut))
+        
+        def visit(item):
+            ctx, directory, top = item
+            if closed.is_set():
+                return []
+            unknown = [] if cpu else None
+            found, descend = scan_directory(directory, self.rules, self.recurse, exclude,
+                                            ctx.folders if top else None, self.index,
+                                            unknown.append if cpu else None)
+            if unknown:
+                pending = []
+                for entry in unknown:
+                    # Já detectado (mesmo inode, mtime e tamanho): não vai para o pool
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if not stat.S_ISREG(st.st_mode):
+                        continue  # link para arquivo: não é lido pelo conteúdo
+                    key = _sniff_key(st)
+                    pair, kind = self._route(ctx, st)
+                    cat = _cached_sniff(key)
+                    if cat is _SNIFF_MISS:
+                        pending.append((ctx, entry.path, entry.name, key, pair, kind))
+                    elif cat in ctx.cat_dests:
+                        emit(FileTask(entry.path, entry.name, ctx.cat_dests[cat], cat, kind,
+                                      pair, False, st.st_size if self.with_size else None, None))
+                if self.metrics and len(pending) < len(unknown):
+                    self.metrics.count("sniff_cached", len(unknown) - len(pending))
+                with lock:
+                    sniff_batch.extend(pending)
+                flush_sniff()
+            if self.metrics:
+                self.metrics.count("dirs_scanned")
+                if self.with_size:
+                    self.metrics.count("scan_stats", len(found))
+            for entry, cat in found:
+                try:
+                    st = entry.stat(follow_symlinks=False) if self.with_size else None
+                except OSError:
+                    continue  # sumiu entre a listagem e o stat (temporários de navegador)
+                pair, kind = self._route(ctx, st)
+                emit(FileTask(entry.path, entry.name, ctx.cat_dests[cat], cat, kind, pair,
+                              entry.is_symlink(), st.st_size if st is not None else None, None))
+            with lock:
+                ctx.pending += len(descend) - 1
+                finished = ctx.pending == 0
+            if finished and self.on_source_done:
+                self.on_source_done(ctx.label)
+            return [(ctx, child, False) for child in descend]
+        
+        walker = WorkStealingWalker(self.scan_workers, visit)
+        
+        def walk():
+            try:
+                walker.run([(ctx, ctx.path, True) for ctx in contexts])
+                if cpu:
+                    flush_sniff(force=True)
+                    with sniff_idle:
+                        sniff_idle.wait_for(lambda: sniff_pending[0] == 0)
+                errors = walker.errors + sniff_errors
+                if errors:
+                    emit(errors[0])
+            finally:
+                emit(_SCAN_DONE)
+        
+        threading.Thread(target=walk, daemon=True).start()
+        try:
+            while True:
+                item = results.get()
+                if item is _SCAN_DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            closed.set()
+            if own_cpu:
+                cpu.shutdown(wait=False, cancel_futures=True)
+        
+        for ctx in contexts:
+            self.folders.extend(
+                FileTask(child.path, child.name, ctx.dest_folders, "Pastas", ctx.kind, ctx.pair,
+                         child.is_link, None, None)
+                for child in ctx.folders
+            )
+    
+    def _route(self, ctx, st):
+        """(par de dispositivos, pool) de um arquivo pelo seu próprio st_dev: um ponto de
+        montagem dentro da origem não pode marcar a origem inteira como "sem rename".
+        Sem st (ou com st_dev 0, como no DirEntry do Windows) vale o par da origem."""
+        if st is None or not st.st_dev or st.st_dev == ctx.pair[0]:
+            return ctx.pair, ctx.kind
+        return (st.st_dev, self.dest_dev), "rename" if st.st_dev == self.dest_dev else "copy"
+    
+    def _prepare(self, label, path):
+        """Destinos e caminho de movimento (rename/cópia) de uma origem"""
+        ctx = SourceContext(label, path)
+        origin_root = self.origin_root(label)
+        ctx.pair = (device_of(path), self.dest_dev)
+        ctx.kind = "rename" if ctx.pair[0] is not None and ctx.pair[0] == ctx.pair[1] else "copy"
+        ctx.cat_dests = {cat: os.path.join(origin_root, category_folder(cat))
+                         for cat in self.rules.categories}
+        ctx.dest_folders = os.path.join(origin_root, "Pastas")
+        return ctx
+
+class OrganizePlan:
+    """Plano completo de uma organização, calculado sem tocar no disco.
+    
+    moves e folders são FileTask com o destino final (nomes de colisão já resolvidos);
+    per_category guarda [arquivos, bytes] por categoria. execute_plan() executa o plano
+    sem varrer as origens de novo.
+    """
+    
+    def __init__(self, sources, categories, mode, root_dest, recurse):
+        self.sources = sources
+        self.categories = categories
+        self.mode = mode
+        self.root_dest = root_dest
+        self.recurse = recurse
+        self.moves = []
+        self.folders = []
+        self.missing = []
+        self.per_category = {}
+        self.names = NameRegistry()
+        self.index = None
+        self.created = time.time()
+    
+    @property
+    def total_files(self):
+        return len(self.moves)
+    
+    @property
+    def total_bytes(self):
+        return sum(size for _, size in self.per_category.values())
+    
+    def summary(self, limit=200):
+        """Linhas legíveis do plano (totais por categoria e os primeiros movimentos)"""
+        limit = len(self.moves) + len(self.folders) if limit is None else limit
+        lines = [f"📦 {self.total_files} arquivos ({format_size(self.total_bytes)}) "
+                 f"e {len(self.folders)} pastas"]
+        for cat, (count, size) in sorted(self.per_category.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  • {cat}: {count} arquivos, {format_size(size)}")
+        for path in self.missing:
+            lines.append(f"⚠️ Origem não encontrada: {path}")
+        lines.append("")
+        for task in self.moves[:limit]:
+            lines.append(f"{task.source} → {task.destination}")
+        for task in self.folders[:max(0, limit - len(self.moves))]:
+            lines.append(f"📂 {task.source} → {task.destination}")
+        hidden = len(self.moves) + len(self.folders) - limit
+        if hidden > 0:
+            lines.append(f"… e mais {hidden} movimentos")
+        return lines
+
+def format_size(size):
+    """Tamanho em bytes para leitura humana"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def plan_organization(sources, categories, mode, dest_base, dest_name, recurse,
+                      progress_callback=None, incremental=False, sniff=False, rules=None,
+                      scan_workers=SCAN_WORKERS, cpu_executor=None):
+    """Calcula o plano completo (dry-run) com a mesma varredura única da execução real"""
+    root_dest = os.path.join(dest_base, dest_name)
+    plan = OrganizePlan(sources, categories, mode, root_dest, recurse)
+    scanner = SourceScanner(
+        sources, categories, mode, root_dest, recurse, with_size=True,
+        on_source_done=lambda label: progress_callback and progress_callback(
+            0, 1, f"📊 {len(plan.moves)} arquivos planejados até {label}..."),
+        incremental=incremental, sniff=sniff, rules=rules, scan_workers=scan_workers,
+        cpu_executor=cpu_executor,
+    )
+    
+    for task in scanner:
+        destination = plan.names.reserve(task.dest_dir, task.name)
+        plan.moves.append(task._replace(destination=destination))
+        stats = plan.per_category.setdefault(task.category, [0, 0])
+        stats[0] += 1
+        stats[1] += task.size
+    
+    for task in scanner.folders:
+        plan.folders.append(task._replace(destination=plan.names.reserve(task.dest_dir, task.name)))
+    plan.missing = scanner.missing
+    plan.index = scanner.index
+    
+    if progress_callback:
+        progress_callback(1, 1, f"✅ Plano: {plan.total_files} arquivos, {format_size(plan.total_bytes)}")
+    return plan
+
+def execute_plan(plan, progress_callback=None, **options):
+    """Executa um plano calculado por plan_organization() sem varrer as origens novamente"""
+    dest_base, dest_name = os.path.split(plan.root_dest)
+    return organize(plan.sources, plan.categories, plan.mode, dest_base, dest_name, plan.recurse,
+                    progress_callback, plan=plan, **options)
+
+# ==================== DUPLICADOS ====================
+DEDUP_POLICIES = ("skip", "hardlink", "folder")
+DEDUP_FOLDER = "Duplicados"
+HASH_EDGE = 4096           # bytes lidos do início e do fim na segunda etapa
+HASH_CHUNK = 1024 * 1024
+
+def _edge_hash(item):
+    """Hash do início e do fim do arquivo (arquivos pequenos ficam com hash completo)"""
+    path, size = item
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(HASH_EDGE), digest_size=16)
+            if size > 2 * HASH_EDGE:
+                f.seek(size - HASH_EDGE)
+            digest.update(f.read(HASH_EDGE))
+        return digest.digest()
+    except OSError:
+        return None
+
+def _full_hash(path):
+    """BLAKE2b do conteúdo inteiro, lido em blocos"""
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+        return digest.digest()
+    except OSError:
+        return None
+
+def find_duplicates(tasks, workers=None, executor=None):
+    """Encontra arquivos de conteúdo idêntico entre as tarefas (que precisam ter size).
+    
+    Filtra em três etapas: mesmo tamanho, mesmo hash do início/fim e só então o hash
+    completo dos que ainda colidem, com os hashes distribuídos em lotes pelo executor
+    (BatchExecutor; sem ele, um pool próprio de `workers` processos).
+    Retorna {origem duplicada: origem mantida}; a mantida é a primeira na ordem das tarefas.
+    """
+    by_size = {}
+    for task in tasks:
+        if task.size and not task.is_link:
+            by_size.setdefault(task.size, []).append(task.source)
+    candidates = [(path, size) for size, paths in by_size.items() if len(paths) > 1
+                  for path in paths]
+    if not candidates:
+        return {}
+    own_executor = executor is None
+    executor = executor or BatchExecutor(workers=workers)
+    try:
+        return _group_duplicates(candidates, executor)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+def _group_duplicates(candidates, executor):
+    """Hash das bordas e depois completo das candidatas (mesmo tamanho) até os grupos"""
+    by_edge = {}
+    for (path, size), key in zip(candidates, executor.map(_edge_hash, candidates)):
+        if key is not None:
+            by_edge.setdefault((size, key), []).append(path)
+    
+    groups = []
+    full = []
+    for (size, key), paths in by_edge.items():
+        if len(paths) < 2:
+            continue
+        if size <= 2 * HASH_EDGE:
+            groups.append(paths)  # o hash das bordas já cobriu o arquivo inteiro
+        else:
+            full.extend(paths)
+    
+    by_content = {}
+    # Lotes de um arquivo: os tamanhos variam demais para dividir por quantidade
+    for path, key in zip(full, executor.map(_full_hash, full, batch_size=1)):
+        if key is not None:
+            by_content.setdefault(key, []).append(path)
+    groups.extend(paths for paths in by_content.values() if len(paths) > 1)
+    
+    duplicates = {}
+    for paths in groups:
+        for path in paths[1:]:
+            duplicates[path] = paths[0]
+    return duplicates
+
+# ==================== DIÁRIO DE MOVIMENTOS (JOURNAL) ====================
+JOURNAL_DIR = ".organizepy"
+RECOVER_ACTIONS = ("resume", "rollback")
+
+class MoveJournal:
+    """Diário write-ahead de uma execução (JSONL só de acréscimo em root_dest/.organizepy).
+    
+    Cada movimento é gravado como intenção ("intent") antes de acontecer e como concluído
+    ("done") ou abortado ("abort") depois. As intenções são gravadas em lote com um único
+    fsync por chamada de intents(); os registros de conclusão ficam no buffer e vão para o
+    disco junto com o próximo lote (a recuperação confere o disco para intenções sem "done").
+    Os abortos, raros, têm fsync na hora: sem eles a recuperação poderia tomar um arquivo
+    criado por outro processo no destino por uma cópia nossa interrompida e apagá-lo.
+    Uma cópia entre discos registra o inode do arquivo que criou ("copy") antes de escrever:
+    só um destino com esse inode é apagado como cópia parcial.
+    """
+    def __init__(self, path, first_id=0):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._next_id = first_id
+        self._append({"op": "begin", "time": round(time.time(), 3)})
+    
+    @classmethod
+    def create(cls, root_dest):
+        """Abre um diário novo para uma execução em root_dest"""
+        folder = os.path.join(root_dest, JOURNAL_DIR)
+        os.makedirs(folder, exist_ok=True)
+        now = time.time()
+        # Milissegundos no nome: duas execuções no mesmo segundo ainda ficam em ordem
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+        path = make_unique_path(os.path.join(folder, f"journal_{stamp}.jsonl"))
+        return cls(path)
+    
+    def _append(self, record):
+        self._buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    def _sync(self):
+        """Grava o buffer e faz fsync (chamado com o lock)"""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def intents(self, moves, kind="file", parent=None):
+        """Registra (origem, destino) de um lote com um fsync; retorna os ids na mesma ordem.
+        parent é a intenção da pasta copiada entre discos a que os arquivos pertencem."""
+        with self._lock:
+            ids = []
+            for src, dst in moves:
+                ids.append(self._next_id)
+                record = {"op": "intent", "id": self._next_id, "kind": kind, "src": src, "dst": dst}
+                if parent is not None:
+                    record["parent"] = parent
+                self._append(record)
+                self._next_id += 1
+            self._sync()
+        return ids
+    
+    def done(self, move_id):
+        with self._lock:
+            self._append({"op": "done", "id": move_id})
+    
+    def abort(self, move_id):
+        with self._lock:
+            self._append({"op": "abort", "id": move_id})
+            self._sync()
+    
+    def copying(self, move_id, inode):
+        """Cópia de move_id começou em um arquivo novo com esse inode (vai para o sistema
+        operacional na hora, sem fsync: sem o registro a recuperação só põe o destino de lado)"""
+        with self._lock:
+            self._append({"op": "copy", "id": move_id, "inode": inode})
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+            self._file.flush()
+    
+    def copy_started(self, move_id):
+        """Callback started do MoveEngine para move_id (None sem diário)"""
+        return None if move_id is None else lambda inode: self.copying(move_id, inode)
+    
+    def mark(self, op, move_id=None):
+        """Registra um evento avulso ("undo", "end", "undo_end"...)"""
+        record = {"op": op, "time": round(time.time(), 3)}
+        if move_id is not None:
+            record["id"] = move_id
+        with self._lock:
+            self._append(record)
+    
+    def close(self, complete=True):
+        with self._lock:
+            if complete:
+                self._append({"op": "end", "time": round(time.time(), 3)})
+            self._sync()
+            self._file.close()
+
+class JournalState:
+    """Estado de um diário lido do disco"""
+    def __init__(self, path):
+        self.path = path
+        self.moves = {}
+        self.done = set()
+        self.aborted = set()
+        self.undone = set()
+        self.copies = {}  # id -> inode do destino criado pela cópia
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Última linha cortada por uma queda: o resto do diário continua válido
+                    continue
+                op = record.get("op")
+                if op == "intent":
+                    self.moves[record["id"]] = record
+                elif op == "done":
+                    self.done.add(record["id"])
+                elif op == "abort":
+                    self.aborted.add(record["id"])
+                elif op == "undo":
+                    self.undone.add(record["id"])
+                elif op == "copy":
+                    self.copies[record["id"]] = record["inode"]
+    
+    def next_id(self):
+        """Primeiro id livre para continuar gravando no mesmo diário"""
+        return max(self.moves, default=-1) + 1
+    
+    def pending(self):
+        """Intenções sem conclusão nem aborto (execução interrompida)"""
+        return [m for i, m in self.moves.items() if i not in self.done and i not in self.aborted]
+    
+    def completed(self):
+        """Movimentos concluídos e ainda não desfeitos, na ordem em que foram registrados"""
+        return [m for i, m in self.moves.items() if i in self.done and i not in self.undone]
+
+_JOURNAL_NAME = re.compile(r"journal_(\d{8}_\d{6})(?:_(\d{3}))?(?: \((\d+)\))?\.jsonl$")
+
+def _journal_order(name):
+    """Chave de ordem cronológica: data, milissegundos e o contador " (n)" de make_unique_path.
+    Em ordem alfabética "journal_X (1).jsonl" viria antes de "journal_X.jsonl"."""
+    match = _JOURNAL_NAME.match(name)
+    if not match:
+        return ("", 0, 0, name)
+    stamp, ms, n = match.groups()
+    return (stamp, int(ms or 0), int(n or 0), name)
+
+def find_journals(root_dest):
+    """Diários de root_dest, do mais antigo para o mais recente"""
+    folder = os.path.join(root_dest, JOURNAL_DIR)
+    try:
+        names = sorted((n for n in os.listdir(folder) if n.endswith(".jsonl")), key=_journal_order)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(folder, n) for n in names]
+
+def journal_finished(path):
+    """Indica se o diário termina com "end" ou "undo_end", lendo só o final do arquivo"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 4096))
+            lines = f.read().decode("utf-8", "replace").splitlines()
+    except OSError:
+        return True
+    for line in reversed(lines):
+        try:
+            return json.loads(line).get("op") in ("end", "undo_end")
+        except ValueError:
+            continue  # linha cortada por uma queda
+    return False
+
+def interrupted_journals(root_dest):
+    """Diários de root_dest sem registro de fim: execuções interrompidas por queda ou erro"""
+    return [path for path in find_journals(root_dest) if not journal_finished(path)]
+
+def resolve_journal(path):
+    """Aceita o arquivo do diário ou a pasta organizada (usa o diário mais recente)"""
+    if os.path.isdir(path):
+        journals = find_journals(path)
+        if not journals:
+            raise FileNotFoundError(f"nenhum diário encontrado em {path}")
+        return journals[-1]
+    return path
+
+def _run_moves(items, move, workers=None, max_in_flight=256):
+    """Executa move(item) em paralelo com o controle adaptativo do organize().
+    Retorna a lista de (item, retorno, erro ou None) na ordem de conclusão."""
+    if workers:
+        limiter = AdaptiveLimiter(workers, workers, workers)
+    else:
+        limiter = AdaptiveLimiter(4, 1, min(64, max_in_flight))
+    results = []
+    lock = threading.Lock()
+    
+    def run(item):
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result = move(item)
+        except Exception as e:
+            error = e
+        return item, result, error, time.perf_counter() - start
+    
+    def finished(future):
+        item, result, error, elapsed = future.result()
+        limiter.release(elapsed)
+        with lock:
+            results.append((item, result, error))
+    
+    with ThreadPoolExecutor(max_workers=limiter.maximum) as executor:
+        for item in items:
+            limiter.acquire()
+            executor.submit(run, item).add_done_callback(finished)
+    return results
+
+def _same_inode(path_a, path_b):
+    """Os dois caminhos são o mesmo arquivo (hard link), sem seguir links simbólicos"""
+    a, b = os.lstat(path_a), os.lstat(path_b)
+    return (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino)
+
+def _reconcile(state, journal):
+    """Confere no disco as intenções sem conclusão de uma execução interrompida.
+    Retorna (concluídas, não iniciadas, avisos)."""
+    finished, untouched, warnings = [], [], []
+    for move in state.pending():
+        src, dst = move["src"], move["dst"]
+        src_exists, dst_exists = os.path.lexists(src), os.path.lexists(dst)
+        if dst_exists and not src_exists:
+            journal.done(move["id"])
+            state.done.add(move["id"])
+            finished.append(move)
+        elif src_exists and not dst_exists:
+            journal.abort(move["id"])
+            state.aborted.add(move["id"])
+            untouched.append(move)
+        elif src_exists and move["kind"] == "file" and _same_inode(src, dst):
+            # Queda entre o link() e o unlink() do rename sem substituição: o dado está na origem
+            os.unlink(dst)
+            journal.abort(move["id"])
+            state.aborted.add(move["id"])
+            untouched.append(move)
+        elif src_exists and move["kind"] == "file" and not os.path.islink(dst) \
+                and device_of(os.path.dirname(src)) == device_of(os.path.dirname(dst)):
+            # No mesmo disco o movimento é um rename atômico: com a origem ainda no lugar ele
+            # não aconteceu, e o destino é de outro arquivo (não há cópia parcial possível)
+            journal.abort(move["id"])
+            state.aborted.add(move["id"])
+            warnings.append(f"⚠️ {dst} já é outro arquivo: {src} continua na origem")
+        elif src_exists and move["kind"] == "file" and not os.path.islink(dst) \
+                and os.path.getsize(dst) < os.path.getsize(src):
+            # Cópia entre discos interrompida: só é nossa se o inode for o registrado no início
+            if state.copies.get(move["id"]) == os.stat(dst).st_ino:
+                os.unlink(dst)
+            else:
+                aside = make_unique_path(f"{dst}.parcial")
+                os.rename(dst, aside)
+                warnings.append(f"⚠️ Destino parcial não confirmado, movido para {aside}")
+            journal.abort(move["id"])
+            state.aborted.add(move["id"])
+            untouched.append(move)
+        elif src_exists:
+            warnings.append(f"⚠️ Verificar manualmente: {src} e {dst} existem")
+        else:
+            journal.abort(move["id"])
+            state.aborted.add(move["id"])
+            warnings.append(f"⚠️ Não encontrado: {src}")
+    return finished, untouched, warnings
+
+def undo_journal(path, progress_callback=None, workers=None):
+    """Desfaz uma execução a partir do seu diário, do último movimento para o primeiro.
+    
+    As pastas voltam primeiro (em ordem reversa) e depois os arquivos, em paralelo com o
+    mesmo MoveEngine e controle adaptativo dos movimentos originais. Se a posição original
+    estiver ocupada o item volta com um nome único. Retorna (restaurados, linhas de log).
+    """
+    path = resolve_journal(path)
+    state = JournalState(path)
+    journal = MoveJournal(path, state.next_id())
+    lines = []
+    restored = 0
+    try:
+        _, _, warnings = _reconcile(state, journal)
+        lines.extend(warnings)
+        moves = state.completed()
+        folders = [m for m in reversed(moves) if m["kind"] == "folder"]
+        # Arquivos de uma pasta copiada entre discos só voltam um a um se ela não terminou
+        files = [m for m in reversed(moves)
+                 if m["kind"] != "folder" and m.get("parent") not in state.done]
+        total = max(1, len(folders) + len(files))
+        names = NameRegistry()
+        engine = MoveEngine()
+        devices = {}
+        lock = threading.Lock()
+        
+        def device(directory):
+            with lock:
+                if directory not in devices:
+                    devices[directory] = device_of(directory)
+                return devices[directory]
+        
+        def restore(move):
+            src, dst = move["src"], move["dst"]
+            if not os.path.lexists(dst) and os.path.lexists(src):
+                return  # já desfeito por uma execução anterior interrompida
+            parent, name = os.path.split(src)
+            os.makedirs(parent, exist_ok=True)
+            target = names.reserve(parent, name)
+            try:
+                if move["kind"] == "folder":
+                    shutil.move(dst, target)
+                else:
+                    pair = (device(os.path.dirname(dst)), device(parent))
+                    engine.move(dst, target, pair, os.path.islink(dst))
+            except BaseException:
+                names.release(target)
+                raise
+            journal.mark("undo", move["id"])
+        
+        def report(move, error):
+            nonlocal restored
+            if error is None:
+                restored += 1
+                lines.append(f"↩️ {os.path.basename(move['src'])}")
+            else:
+                lines.append(f"❌ {move['dst']} : {error}")
+            if progress_callback:
+                progress_callback(len(lines), total, f"↩️ Desfazendo [{len(lines)}/{total}]")
+        
+        for move in folders:
+            try:
+                restore(move)
+                report(move, None)
+            except Exception as e:
+                report(move, e)
+        for move, _, error in _run_moves(files, restore, workers):
+            report(move, error)
+        journal.mark("undo_end")
+    finally:
+        journal.close(complete=False)
+    return restored, lines
+
+def recover_journal(path, action="rollback", progress_callback=None, workers=None):
+    """Recupera uma execução interrompida por queda.
+    
+    action="rollback" desfaz tudo o que chegou a ser movido; action="resume" conclui os
+    movimentos que tinham intenção registrada e não aconteceram. Arquivos que a varredura
+    ainda não tinha alcançado são movidos por uma nova execução normal.
+    Retorna (movimentos tratados, linhas de log).
+    """
+    if action == "rollback":
+        return undo_journal(path, progress_callback, workers)
+    if action != "resume":
+        raise ValueError(f"ação de recuperação inválida: {action}")
+    
+    path = resolve_journal(path)
+    state = JournalState(path)
+    journal = MoveJournal(path, state.next_id())
+    lines = []
+    try:
+        finished, untouched, warnings = _reconcile(state, journal)
+        lines.extend(warnings)
+        engine = MoveEngine()
+        files = [m for m in untouched if m["kind"] != "folder"]
+        folders = [m for m in untouched if m["kind"] == "folder"]
+        
+        def redo(move):
+            os.makedirs(os.path.dirname(move["dst"]), exist_ok=True)
+            move_id, = journal.intents([(move["src"], move["dst"])], move["kind"])
+            try:
+                if move["kind"] == "folder":
+                    shutil.move(move["src"], move["dst"])
+                else:
+                    engine.move(move["src"], move["dst"], None, os.path.islink(move["src"]),
+                                journal.copy_started(move_id))
+            except BaseException:
+                journal.abort(move_id)
+                raise
+            journal.done(move_id)
+        
+        results = _run_moves(files, redo, workers)
+        for move in folders:
+            try:
+                results.append((move, redo(move), None))
+            except Exception as e:
+                results.append((move, None, e))
+        for move, _, error in results:
+            if error is None:
+                lines.append(f"✅ {os.path.basename(move['src'])} → {move['dst']}")
+            else:
+                lines.append(f"❌ {move['src']} : {error}")
+        if progress_callback:
+            progress_callback(1, 1, f"✨ Recuperação concluída: {len(finished) + len(untouched)} movimentos")
+        journal.close()
+    except BaseException:
+        journal.close(complete=False)
+        raise
+    return len(finished) + sum(1 for *_, error in results if error is None), lines
+
+# ==================== FUNÇÃO DE ORGANIZAÇÃO OTIMIZADA ====================
+def organize(sources, categories, mode, dest_base, dest_name, recurse, progress_callback=None,
+             streaming=True, queue_size=1024, max_in_flight=256, workers=None, log_callback=None,
+             structured_log=False, log_tail=1000, plan=None, journal=True, dedup=None,
+             hash_workers=None, incremental=False, sniff=False, rules=None,
+             scan_workers=SCAN_WORKERS, progress=None, metrics=None, cpu_executor=None,
+             recover="resume"):
+    """Versão otimizada com processamento paralelo e pastas por tipo de arquivo.
+    
+    Com streaming=True a varredura roda em uma thread própria e alimenta uma fila limitada
+    (queue_size) consumida pelos workers, então os movimentos começam durante a varredura.
+    No máximo max_in_flight tarefas ficam submetidas ao executor ao mesmo tempo.
+    
+    Renomeações no mesmo disco e cópias entre discos usam pools separados; com
+    workers=None cada pool ajusta sozinho o número de workers, com um inteiro fica fixo.
+    
+    log_callback, se informado, recebe cada linha do log (✅/⭕/❌/📂/⚠️) assim que é gerada.
+    
+    O log.txt é gravado durante a execução por um LogWriter; com structured_log=True também
+    é gravado um log.jsonl (origem, destino, tamanho, duração e status por arquivo). Só as
+    últimas log_tail linhas ficam na memória e são retornadas.
+    
+    Com plan (de plan_organization) as origens não são varridas: o plano é executado.
+    
+    Com journal=True cada movimento é registrado antes e depois em um MoveJournal
+    (root_dest/.organizepy), o que permite undo_journal() e recover_journal(). Execuções
+    anteriores interrompidas neste destino (diário sem fim) são concluídas (recover="resume")
+    ou desfeitas (recover="rollback") antes da varredura; com recover=None só há um aviso.
+    
+    dedup ("skip", "hardlink" ou "folder") ativa a detecção de duplicados por conteúdo
+    (find_duplicates, com hash_workers processos): as cópias extras ficam na origem, viram
+    hard links do arquivo mantido ou vão para a pasta Duplicados. Nesse caso a varredura
+    termina antes dos movimentos começarem.
+    
+    Com incremental=True as pastas de origem que não mudaram desde a última execução neste
+    destino não são listadas de novo (ScanIndex em root_dest/.organizepy).
+    
+    Com sniff=True arquivos sem extensão conhecida são classificados pelo conteúdo.
+    rules (RuleSet de load_rules) troca a classificação por TIPOS por regras do usuário.
+    
+    scan_workers é o número de threads da varredura, independente dos workers de movimento.
+    
+    As subpastas vão para Pastas em paralelo nos mesmos pools: no mesmo disco com um rename,
+    entre discos divididas em cópias de arquivos (progresso em bytes, cada arquivo com sua
+    intenção no diário). Links simbólicos para pastas são movidos como links. Com recurse
+    elas só começam depois que os arquivos de dentro delas foram movidos.
+    
+    O progresso é ponderado por bytes (tamanhos da varredura): progress_callback recebe
+    bytes concluídos e total, e a mensagem traz a vazão e o ETA de um ByteProgress. Passe
+    progress (ByteProgress) para consultar a vazão e o resumo por categoria durante a execução.
+    
+    metrics (RunMetrics, com um observer opcional) recebe tempos por fase (varredura, espera
+    na fila, reservas de nome, diário, movimentos, pastas, callbacks), contadores (arquivos
+    varridos, stat, renames/cópias, colisões, bytes copiados, erros) e latências por
+    caminho. O resumo vai para o log.txt (📈) e, com structured_log, para o log.jsonl.
+    
+    As etapas limitadas por CPU (hashes dos duplicados, detecção por conteúdo) rodam em
+    lotes no cpu_executor (BatchExecutor); sem ele é criado um pool de processos com
+    hash_workers processos, usado pelas duas etapas e encerrado no fim da execução.
+    """
+    if dedup is not None and dedup not in DEDUP_POLICIES:
+        raise ValueError(f"política de duplicados inválida: {dedup}")
+    if recover is not None and recover not in RECOVER_ACTIONS:
+        raise ValueError(f"ação de recuperação inválida: {recover}")
+    run_start = time.perf_counter()
+    metrics = metrics or RunMetrics()
+    # O tempo gasto nos callbacks (interface, terminal) aparece como uma fase própria
+    if progress_callback:
+        progress_callback = metrics.timed("callbacks", progress_callback)
+    if log_callback:
+        log_callback = metrics.timed("callbacks", log_callback)
+    root_dest = os.path.join(dest_base, dest_name)
+    os.makedirs(root_dest, exist_ok=True)
+    log_lines = deque(maxlen=log_tail)
+    moved_count = 0
+    
+    log_file = os.path.join(root_dest, "log.txt")
+    log_writer = LogWriter(log_file)
+    log_writer.write(f"\n\n===== Execução: {time.strftime('%Y-%m-%d %H:%M:%S')} =====")
+    json_writer = LogWriter(os.path.join(root_dest, "log.jsonl")) if structured_log else None
+    interrupted = interrupted_journals(root_dest)  # antes de criar o diário desta execução
+    move_journal = MoveJournal.create(root_dest) if journal else None
+    own_cpu = cpu_executor is None and (sniff or bool(dedup))
+    cpu = BatchExecutor(workers=hash_workers) if own_cpu else cpu_executor
+    completed = False
+    try:
+        if progress_callback:
+            progress_callback(0, 1, "🔍 Iniciando varredura de arquivos...")
+        
+        total = 0
+        processed = 0
+        scanning = True
+        lock = threading.Lock()
+        idle = threading.Condition(lock)
+        tracker = progress or ByteProgress()
+        engine = MoveEngine(on_bytes=tracker.transferred, metrics=metrics)
+        dirs = DestinationDirs(metrics)  # cada pasta de destino criada só com o primeiro arquivo
+        tasks = queue.Queue(maxsize=queue_size if streaming else 0)
+        scan_errors = []
+        
+        def add_log(line, record=None):
+            with lock:
+                log_lines.append(line)
+            log_writer.write(line)
+            if json_writer and record is not None:
+                record.setdefault("time", round(time.time(), 3))
+                json_writer.write(json.dumps(record, ensure_ascii=False))
+            if log_callback:
+                log_callback(line)
+        
+        def log_missing(path):
+            add_log(f"⚠️ Origem não encontrada: {path}", {"status": "missing", "source": path})
+        
+        def source_done(label):
+            if progress_callback:
+                progress_callback(*tracker.position(), f"📊 Encontrados {total} arquivos em {label}...")
+        
+        # Execução anterior interrompida: concluída ou desfeita antes de varrer de novo
+        for path in interrupted:
+            if recover is None:
+                add_log(f"⚠️ Execução interrompida: {path} (use --resume ou --undo)",
+                        {"status": "interrupted", "journal": path})
+                continue
+            if progress_callback:
+                progress_callback(0, 1, "♻️ Recuperando execução interrompida...")
+            count, lines = recover_journal(path, recover, workers=workers)
+            for line in lines:
+                add_log(line)
+            action = "concluída" if recover == "resume" else "desfeita"
+            add_log(f"♻️ Execução interrompida {action}: {count} movimentos ({os.path.basename(path)})",
+                    {"status": "recovered", "journal": path, "action": recover, "moves": count})
+        
+        if plan is None:
+            names = NameRegistry()
+            scanner = SourceScanner(sources, categories, mode, root_dest, recurse,
+                                    with_size=True,
+                                    on_missing=log_missing,
+                                    on_source_done=source_done, incremental=incremental,
+                                    sniff=sniff, rules=rules, scan_workers=scan_workers,
+                                    metrics=metrics, cpu_executor=cpu)
+            task_source = scanner
+        else:
+            names = plan.names
+            for path in plan.missing:
+                log_missing(path)
+            task_source = plan.moves
+        collisions_start = names.collisions
+        index = scanner.index if plan is None else plan.index
+        
+        def keep_indexed(task):
+            """A pasta de um arquivo que ficou na origem é listada de novo na próxima execução"""
+            if index is not None:
+                index.invalidate(os.path.dirname(task.source))
+        
+        duplicates = {}
+        linked = []
+        destinations = {}
+        if dedup:
+            # Duplicados só aparecem com todos os tamanhos conhecidos: varre tudo antes
+            with metrics.phase("scan"):
+                task_source = list(task_source)
+            if progress_callback:
+                progress_callback(0, 1, f"🔍 Procurando duplicados em {len(task_source)} arquivos...")
+            with metrics.phase("dedup"):
+                duplicates = find_duplicates(task_source, hash_workers, cpu)
+            metrics.count("duplicates", len(duplicates))
+            dup_dir = os.path.join(root_dest, DEDUP_FOLDER)
+            routed = []
+            for task in task_source:
+                original = duplicates.get(task.source)
+                if original is None:
+                    routed.append(task)
+                elif dedup == "skip":
+                    keep_indexed(task)
+                    add_log(f"⭕ {task.name} é duplicado de {original}",
+                            {"status": "duplicate", "source": task.source, "original": original})
+                elif dedup == "hardlink":
+                    destinations[original] = None
+                    linked.append(task)
+                else:
+                    if task.destination:
+                        names.release(task.destination)
+                    routed.append(task._replace(dest_dir=dup_dir, category=DEDUP_FOLDER,
+                                                destination=None))
+            task_source = routed
+            for task in linked:
+                tracker.add(task.category, "rename", task.size)
+        
+        def scan():
+            """Produtor: percorre cada origem uma única vez (ou o plano) e enfileira as tarefas"""
+            nonlocal total, scanning
+            start = time.perf_counter()
+            waited = 0.0
+            try:
+                for task in task_source:
+                    with lock:
+                        total += 1
+                    tracker.add(task.category, task.kind, task.size)
+                    put_start = time.perf_counter()
+                    tasks.put(task)
+                    waited += time.perf_counter() - put_start
+            except Exception as e:
+                if not streaming:
+                    raise
+                scan_errors.append(e)
+            finally:
+                with lock:
+                    scanning = False
+                tracker.finish_scan()
+                tasks.put(None)
+                # Tempo bloqueado na fila cheia é espera pelos movimentos, não varredura
+                metrics.add_time("scan", time.perf_counter() - start - waited)
+                metrics.add_time("scan_queue_wait", waited)
+                metrics.count("files_scanned", total)
+            
+            if progress_callback:
+                progress_callback(*tracker.position(), f"✅ Total: {total} arquivos para organizar")
+        
+        def process_file(task, move_id):
+            nonlocal moved_count
+            
+            start = time.perf_counter()
+            record = {"source": task.source, "category": task.category} if json_writer else None
+            try:
+                dest_path = _move_task(task, names, engine, move_journal, move_id, dirs)
+                with lock:
+                    moved_count += 1
+                    if task.source in destinations:
+                        destinations[task.source] = dest_path
+                line = f"✅ {task.name} → {task.category}"
+                if record is not None:
+                    record.update(status="moved", destination=dest_path, size=task.size)
+                tracker.done(task.category, task.kind, task.size)
+            except Exception as e:
+                line = f"❌ {task.source} : {e}"
+                if record is not None:
+                    record.update(status="error", error=str(e))
+                keep_indexed(task)
+                tracker.done(task.category, task.kind, task.size, failed=True)
+                metrics.count("errors")
+            elapsed = time.perf_counter() - start
+            if record is not None:
+                record["duration"] = round(elapsed, 6)
+            return line, record, elapsed
+        
+        # Um pool por caminho: renomear é só metadado, copiar entre discos é limitado por E/S
+        if workers:
+            limiters = {kind: AdaptiveLimiter(workers, workers, workers) for kind in ("rename", "copy")}
+        else:
+            limiters = {
+                "rename": AdaptiveLimiter(4, 1, min(16, max_in_flight)),
+                "copy": AdaptiveLimiter(4, 1, min(64, max_in_flight)),
+            }
+        
+        def file_done(future, file_name, limiter):
+            nonlocal processed
+            line, record, elapsed = future.result()
+            limiter.release(elapsed)
+            add_log(line, record)
+            with lock:
+                processed += 1
+                current, known = processed, total
+                suffix = "+" if scanning else ""
+                if not scanning and processed >= total:
+                    idle.notify_all()
+            
+            if progress_callback:
+                # Mostrar nome do arquivo sendo processado, com vazão e ETA
+                status_msg = f"📦 [{current}/{known}{suffix}] {file_name[:50]}... · {tracker.status()}"
+                progress_callback(*tracker.position(), status_msg)
+        
+        def folder_target(child, make, kind="folder"):
+            """Reserva o nome da pasta em Pastas e registra a intenção no diário"""
+            dirs.ensure(child.dest_dir)
+            target = child.destination or names.reserve(child.dest_dir, child.name)
+            while True:
+                move_id, = move_journal.intents([(child.source, target)], kind) if move_journal else (None,)
+                try:
+                    make(target)
+                    return target, move_id
+                except FileExistsError:
+                    # Criada por outro processo: a reserva fica ocupada e outro nome é tentado
+                    if move_journal:
+                        move_journal.abort(move_id)
+                    target = names.reserve(child.dest_dir, child.name)
+                except BaseException:
+                    if move_journal:
+                        move_journal.abort(move_id)
+                    raise
+        
+        def folder_moved(child, target, move_id):
+            if move_journal:
+                move_journal.done(move_id)
+            add_log(f"📂 {child.name} → Pastas",
+                    {"status": "folder", "source": child.source, "destination": target})
+        
+        def folder_failed(child, move_id, error):
+            metrics.count("errors")
+            if move_id is not None:
+                move_journal.abort(move_id)
+            add_log(f"❌ Pasta {child.name} : {error}",
+                    {"status": "error", "source": child.source, "error": str(error)})
+        
+        def rename_folder(child):
+            """Pasta no mesmo disco: um único rename atômico. Um link simbólico para pasta
+            é movido como link pelo MoveEngine (em qualquer disco), nunca o conteúdo."""
+            start = time.perf_counter()
+            move_id = None
+            tried = []  # nome reservado da última tentativa de rename
+            
+            def rename(target):
+                tried.append(target)
+                _rename_dir_noreplace(child.source, target)
+            
+            try:
+                if child.is_link:
+                    target, move_id = folder_target(
+                        child, lambda target: engine.move(child.source, target, child.pair, True), "file")
+                else:
+                    target, move_id = folder_target(child, rename)
+                folder_moved(child, target, move_id)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    folder_failed(child, move_id, e)
+                else:
+                    # Ponto de montagem no meio do caminho: copia como as pastas entre discos,
+                    # para o mesmo nome já reservado (a pasta da reserva já foi removida)
+                    copy_folder(child._replace(kind="copy", destination=tried[-1] if tried else None))
+            except Exception as e:
+                folder_failed(child, move_id, e)
+            tracker.done(child.category, child.kind, 0, folder=True)
+            elapsed = time.perf_counter() - start
+            metrics.observe("folder", elapsed)
+            return elapsed
+        
+        folder_bytes = [0, 0]  # [copiados, total]
+        
+        def copy_folder(child):
+            """Pasta entre discos: cada arquivo vira uma cópia no pool de cópia, com sua
+            própria intenção no diário (se a pasta não terminar, o undo devolve o que foi)"""
+            move_id = None
+            try:
+                target, move_id = folder_target(child, os.mkdir)
+                job = FolderCopy(child, target, move_id)
+                try:
+                    size = job.expand()
+                except BaseException:
+                    os.rmdir(target)  # nada foi copiado: libera o destino
+                    raise
+                with lock:
+                    folder_bytes[1] += size
+                job.create_dirs()
+                moves = [(src, dst) for src, dst, _, _, _ in job.files]
+                job.file_ids = (move_journal.intents(moves, "file", parent=move_id)
+                                if move_journal and moves else [None] * len(moves))
+                for _, _, _, size, _ in job.files:
+                    tracker.add(child.category, "copy", size)
+            except Exception as e:
+                folder_failed(child, move_id, e)
+                return
+            if not job.files:
+                finish_folder(job)
+            limiter = limiters["copy"]
+            for (src, dst, is_link, size, pair), file_id in zip(job.files, job.file_ids):
+                limiter.acquire()
+                future = executors["copy"].submit(copy_folder_file, child, src, dst, is_link, size,
+                                                  pair, file_id)
+                future.add_done_callback(
+                    lambda fut, job=job, size=size: folder_file_done(fut, job, size, limiter))
+        
+        def copy_folder_file(child, src, dst, is_link, size, pair, file_id):
+            start = time.perf_counter()
+            try:
+                engine.move(src, dst, pair, is_link,
+                            move_journal.copy_started(file_id) if move_journal else None)
+                error = None
+                if file_id is not None:
+                    move_journal.done(file_id)
+            except Exception as e:
+                error = e
+                if file_id is not None:
+                    move_journal.abort(file_id)
+            tracker.done(child.category, "copy", size, failed=error is not None)
+            return error, time.perf_counter() - start
+        
+        def folder_file_done(future, job, size, limiter):
+            error, elapsed = future.result()
+            limiter.release(elapsed)
+            with lock:
+                folder_bytes[0] += size
+                job.remaining -= 1
+                if error is not None:
+                    job.errors.append(error)
+                last = job.remaining == 0
+                copied, known = folder_bytes
+            if progress_callback:
+                progress_callback(*tracker.position(), f"📂 Copiando pastas: {format_size(copied)} "
+                                                       f"de {format_size(known)} · {tracker.status()}")
+            if last:
+                finish_folder(job)
+        
+        def finish_folder(job):
+            try:
+                if job.errors:
+                    raise OSError(f"{len(job.errors)} itens não copiados ({job.errors[0]})")
+                job.finish()
+                folder_moved(job.child, job.target, job.move_id)
+            except Exception as e:
+                folder_failed(job.child, job.move_id, e)
+        
+        def relocate_folders(folders):
+            metrics.count("folders", len(folders))
+            if progress_callback:
+                progress_callback(*tracker.position(), f"📁 Organizando {len(folders)} pastas...")
+            for child in folders:
+                if child.kind == "copy" and not child.is_link:
+                    copy_folder(child)
+                    continue
+                # Pastas no mesmo disco e links para pastas (em qualquer disco): um movimento só
+                tracker.add(child.category, child.kind, 0, folder=True)
+                limiter = limiters[child.kind]
+                limiter.acquire()
+                executors[child.kind].submit(rename_folder, child).add_done_callback(
+                    lambda fut, limiter=limiter: limiter.release(fut.result()))
+        
+        if streaming:
+            scanner_thread = threading.Thread(target=scan, daemon=True)
+            scanner_thread.start()
+        else:
+            scan()
+        
+        # Consumidor: os workers recebem as tarefas assim que a varredura as encontra
+        executors = {kind: ThreadPoolExecutor(max_workers=limiter.maximum)
+                     for kind, limiter in limiters.items()}
+        moves_start = time.perf_counter()
+        folders_start = None
+        try:
+            finished = False
+            while not finished:
+                # Lote do que já está na fila: destinos reservados aqui e as intenções
+                # gravadas no diário com um único fsync antes de qualquer movimento
+                batch = [tasks.get()]
+                while batch[-1] is not None and len(batch) < 256:
+                    try:
+                        batch.append(tasks.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    batch.pop()
+                    finished = True
+                with metrics.phase("reserve"):
+                    batch = [task if task.destination else
+                             task._replace(destination=names.reserve(task.dest_dir, task.name))
+                             for task in batch]
+                    for task in batch:
+                        dirs.ensure(task.dest_dir)  # consulta em memória depois do primeiro
+                if move_journal and batch:
+                    with metrics.phase("journal"):
+                        move_ids = move_journal.intents([(t.source, t.destination) for t in batch])
+                else:
+                    move_ids = [None] * len(batch)
+                
+                for task, move_id in zip(batch, move_ids):
+                    # Janela limitada pelo controlador do caminho; nenhum Future é guardado
+                    limiter = limiters[task.kind]
+                    limiter.acquire()
+                    future = executors[task.kind].submit(process_file, task, move_id)
+                    future.add_done_callback(
+                        lambda fut, name=task.name, lim=limiter: file_done(fut, name, lim))
+            
+            if streaming:
+                scanner_thread.join()
+                if scan_errors:
+                    raise scan_errors[0]
+            
+            # Dependência: com recurse as pastas contêm arquivos que acabaram de ser movidos
+            # (e os duplicados precisam do destino dos originais); sem isso não há espera
+            folders = scanner.folders if plan is None else plan.folders
+            if linked or (folders and recurse):
+                with idle, metrics.phase("files_wait"):
+                    idle.wait_for(lambda: processed >= total)
+            
+            # Duplicados viram hard links do arquivo mantido, já no destino final
+            if linked:
+                if progress_callback:
+                    progress_callback(*tracker.position(), f"🔗 Vinculando {len(linked)} duplicados...")
+                
+                def link_or_move(task):
+                    dirs.ensure(task.dest_dir)
+                    dest_path = task.destination or names.reserve(task.dest_dir, task.name)
+                    move_id, = move_journal.intents([(task.source, dest_path)]) if move_journal else (None,)
+                    target = destinations[duplicates[task.source]]
+                    if target is not None:
+                        try:
+                            os.link(target, dest_path)
+                        except OSError:
+                            target = None  # sistema de arquivos sem hard links
+                        else:
+                            os.unlink(task.source)
+                            if move_journal:
+                                move_journal.done(move_id)
+                    if target is None:
+                        _move_task(task._replace(destination=dest_path), names, engine,
+                                   move_journal, move_id, dirs)
+                    return target is not None
+                
+                def link_duplicate(task):
+                    try:
+                        hard_link = link_or_move(task)
+                    except BaseException:
+                        tracker.done(task.category, "rename", task.size, failed=True)
+                        raise
+                    tracker.done(task.category, "rename", task.size)
+                    return hard_link
+                
+                links_start = time.perf_counter()
+                for task, hard_link, error in _run_moves(linked, link_duplicate, workers):
+                    if error is None:
+                        moved_count += 1
+                        add_log(f"✅ {task.name} → {task.category}" + (" (hard link)" if hard_link else ""),
+                                {"status": "linked" if hard_link else "moved", "source": task.source,
+                                 "original": duplicates[task.source]})
+                    else:
+                        metrics.count("errors")
+                        keep_indexed(task)
+                        add_log(f"❌ {task.source} : {error}",
+                                {"status": "error", "source": task.source, "error": str(error)})
+                metrics.add_time("links", time.perf_counter() - links_start)
+            
+            # Pastas em paralelo nos mesmos pools dos arquivos, com nomes já reservados
+            if folders:
+                folders_start = time.perf_counter()
+                relocate_folders(folders)
+        finally:
+            # "rename" primeiro: uma pasta que cai para cópia (EXDEV) ainda usa o pool "copy"
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+            moves_end = time.perf_counter()
+            metrics.add_time("moves", moves_end - moves_start)
+            if folders_start is not None:
+                metrics.add_time("folders", moves_end - folders_start)
+        metrics.count("collisions", names.collisions - collisions_start)
+        
+        # Estado das pastas de origem para a próxima execução incremental
+        if index is not None:
+            with metrics.phase("index_commit"):
+                index.commit()
+            log_writer.write(f"⚡ Pastas inalteradas puladas: {index.skipped}")
+        
+        # Finalização
+        if progress_callback:
+            progress_callback(*tracker.position(), f"✨ Concluído! {moved_count} arquivos organizados")
+        
+        for line in tracker.breakdown():
+            log_writer.write(line)
+        log_writer.write(f"✨ Arquivos movidos: {moved_count}")
+        completed = True
+        return list(log_lines), moved_count, log_file
+    finally:
+        if own_cpu:
+            cpu.shutdown()
+        # Resumo da instrumentação, também quando a execução falha no meio
+        metrics.add_time("total", time.perf_counter() - run_start)
+        for line in metrics.summary_lines():
+            log_writer.write(line)
+        summary = metrics.finish()
+        if json_writer:
+            json_writer.write(json.dumps(dict(summary, status="metrics", time=round(time.time(), 3)),
+                                         ensure_ascii=False))
+        if move_journal:
+            move_journal.close(complete=completed)
+        log_writer.close()
+        if json_writer:
+            json_writer.close()
+
+# ==================== MODO OBSERVAÇÃO (WATCH) ====================
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+
+class InotifyBackend:
+    """Eventos do kernel (Linux) via inotify, com ctypes e sem dependências externas.
+    wait() bloqueia em select até haver evento, sem consumir CPU enquanto nada acontece."""
+    
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._ctypes = ctypes
+        self._dirs = {}
+    
+    def add_dir(self, path):
+        """Observa a pasta; retorna os arquivos que já existem nela"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), f"inotify_add_watch falhou: {path}")
+        self._dirs[wd] = path
+        return _list_dir(path)
+    
+    def wait(self, timeout):
+        """Retorna [(caminho, é_pasta)] criados ou concluídos desde a última chamada"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b"\0")
+            offset += 16 + length
+            if mask & IN_Q_OVERFLOW:
+                # Fila do kernel estourou: lista uma vez as pastas observadas
+                for path in list(self._dirs.values()):
+                    events.extend(_list_dir(path))
+            elif mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+            elif wd in self._dirs and name:
+                is_dir = bool(mask & IN_ISDIR)
+                # Arquivos só interessam quando terminam de ser escritos ou chegam prontos
+                if is_dir or mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    events.append((os.path.join(self._dirs[wd], os.fsdecode(name)), is_dir))
+        return events
+    
+    def close(self):
+        os.close(self._fd)
+
+class PollingBackend:
+    """Alternativa portátil: a cada interval só o mtime das pastas observadas é consultado;
+    uma pasta é listada de novo apenas quando o mtime dela muda."""
+    
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._dirs = {}
+    
+    def add_dir(self, path):
+        entries = _list_dir(path)
+        self._dirs[path] = (_dir_mtime(path), {p for p, _ in entries})
+        return entries
+    
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        events = []
+        for path, (mtime, known) in list(self._dirs.items()):
+            current = _dir_mtime(path)
+            if current is None:
+                del self._dirs[path]
+                continue
+            if current == mtime:
+                continue
+            entries = _list_dir(path)
+            self._dirs[path] = (current, {p for p, _ in entries})
+            events.extend(entry for entry in entries if entry[0] not in known)
+        return events
+    
+    def close(self):
+        self._dirs.clear()
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _list_dir(path):
+    try:
+        with os.scandir(path) as it:
+            return [(entry.path, entry.is_dir(follow_symlinks=False)) for entry in it]
+    except OSError:
+        return []
+
+def watch_backend(poll_interval=1.0):
+    """inotify no Linux; polling por mtime das pastas nos demais sistemas"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend()
+        except (OSError, AttributeError):
+            pass
+    return PollingBackend(poll_interval)
+
+def watch(sources, categories, mode, dest_base, dest_name, recurse=False, log_callback=None,
+          settle=0.5, stop_event=None, backend=None, sniff=False, rules=None):
+    """Observa as origens e organiza cada arquivo novo assim que ele termina de ser escrito.
+    
+    Cada evento adia o arquivo por settle segundos (debounce); só é movido o arquivo cujo
+    mtime ficou parado nesse intervalo. A classificação usa TIPOS (ou rules) e o movimento
+    segue a semântica de move_with_rename. Pastas novas não são movidas (com recurse passam
+    a ser observadas). Com sniff=True arquivos sem extensão conhecida são classificados pelo
+    conteúdo. Bloqueia até stop_event ser acionado; retorna o total de arquivos movidos.
+    """
+    root_dest = os.path.join(dest_base, dest_name)
+    os.makedirs(root_dest, exist_ok=True)
+    exclude = os.path.normcase(os.path.abspath(root_dest))
+    rules = (rules or RuleSet.from_tipos()).select(categories)
+    stop_event = stop_event or threading.Event()
+    backend = backend or watch_backend()
+    log_writer = LogWriter(os.path.join(root_dest, "log.txt"))
+    log_writer.write(f"\n\n===== Observação: {time.strftime('%Y-%m-%d %H:%M:%S')} =====")
+    origins = {}
+    pending = {}
+    dirs = DestinationDirs()
+    moved_count = 0
+    
+    def add_log(line):
+        log_writer.write(line)
+        if log_callback:
+            log_callback(line)
+    
+    def add_tree(path, origin_root, top):
+        """Observa a pasta (e subpastas com recurse); arquivos já presentes só se não for a origem"""
+        if os.path.normcase(os.path.abspath(path)) == exclude:
+            return
+        try:
+            entries = backend.add_dir(path)
+        except OSError as e:
+            add_log(f"⚠️ Não foi possível observar {path}: {e}")
+            return
+        origins[path] = origin_root
+        for entry, is_dir in entries:
+            if is_dir:
+                if recurse:
+                    add_tree(entry, origin_root, False)
+            elif not top:
+                pending[entry] = time.monotonic() + settle
+    
+    def handle(path):
+        nonlocal moved_count
+        parent = os.path.dirname(path)
+        name = os.path.basename(path)
+        cat = rules.classify_name(name, lambda: os.lstat(path))
+        ambiguous = cat is None and sniff and rules.needs_sniffing(name)
+        if (cat is None and not ambiguous) or parent not in origins:
+            return
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return  # já removido ou renomeado (ex.: .part → nome final)
+        if not stat.S_ISREG(st.st_mode):
+            return
+        if time.time() - st.st_mtime < settle:
+            pending[path] = time.monotonic() + settle  # ainda sendo escrito
+            return
+        if ambiguous:
+            cat = sniff_category(path, st)
+            if cat not in rules.categories:
+                return
+        try:
+            dest_path = move_with_rename(path, os.path.join(origins[parent], category_folder(cat)), dirs)
+            if dest_path:
+                moved_count += 1
+                add_log(f"✅ {os.path.basename(path)} → {cat}")
+        except Exception as e:
+            add_log(f"❌ {path} : {e}")
+    
+    try:
+        for label, path in sources:
+            if not os.path.isdir(path):
+                add_log(f"⚠️ Origem não encontrada: {path}")
+                continue
+            add_tree(path, os.path.join(root_dest, label) if mode.upper() == "A" else root_dest, True)
+        add_log(f"👀 Observando {len(origins)} pastas ({type(backend).__name__})")
+        
+        while not stop_event.is_set():
+            now = time.monotonic()
+            # Sem pendências espera só pelo próximo evento (ou pela checagem de parada)
+            timeout = min(1.0, max(0.0, min(pending.values()) - now)) if pending else 1.0
+            for path, is_dir in backend.wait(timeout):
+                if is_dir:
+                    if recurse and os.path.dirname(path) in origins:
+                        add_tree(path, origins[os.path.dirname(path)], False)
+                else:
+                    pending[path] = time.monotonic() + settle
+            
+            now = time.monotonic()
+            for path in [p for p, deadline in pending.items() if deadline <= now]:
+                del pending[path]
+                handle(path)
+    finally:
+        backend.close()
+        log_writer.write(f"✨ Arquivos movidos: {moved_count}")
+        log_writer.close()
+    return moved_count
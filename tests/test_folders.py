@@ -0,0 +1,58 @@
+# Testes das pastas movidas para "Pastas" (recurse desligado)
+import errno
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import organizer
+from organizer import ByteProgress, JournalState, find_journals, organize, undo_journal
+
+class FolderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.src = os.path.join(self.tmp, "origem")
+        self.root = os.path.join(self.tmp, "Organizados")
+        os.makedirs(os.path.join(self.src, "Projeto", "docs"))
+        for name in ("a.txt", os.path.join("docs", "b.txt")):
+            with open(os.path.join(self.src, "Projeto", name), "w", encoding="utf-8") as f:
+                f.write(name)
+
+    def test_rename_exdev_falls_back_to_copy_under_the_same_name(self):
+        real = organizer._rename_dir_noreplace
+
+        def exdev(src, dst):
+            real(src, dst + ".tmp")  # cria e remove a reserva como o original
+            os.rename(dst + ".tmp", src)
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+        with mock.patch.object(organizer, "_rename_dir_noreplace", exdev):
+            organize([("origem", self.src)], list(organizer.TIPOS), "B", self.tmp, "Organizados", False)
+
+        folders = os.path.join(self.root, "Pastas")
+        self.assertEqual(os.listdir(folders), ["Projeto"])
+        self.assertEqual(sorted(os.listdir(os.path.join(folders, "Projeto"))), ["a.txt", "docs"])
+        self.assertEqual(os.listdir(self.src), [])
+
+        self.assertEqual(JournalState(find_journals(self.root)[-1]).pending(), [])
+        undo_journal(self.root)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.src, "Projeto"))), ["a.txt", "docs"])
+
+    def test_progress_counts_moved_folders_apart_from_files(self):
+        with open(os.path.join(self.src, "c.pdf"), "wb") as f:
+            f.write(b"x" * 2048)
+        progress = ByteProgress()
+
+        organize([("origem", self.src)], list(organizer.TIPOS), "B", self.tmp, "Organizados", False,
+                 progress=progress)
+
+        self.assertEqual(progress.breakdown(), ["📁 PDF: 1/1 arquivos, 2.0 KB de 2.0 KB",
+                                                "📁 Pastas: 1/1 pastas"])
+
+if __name__ == "__main__":
+    unittest.main()
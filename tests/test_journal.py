@@ -0,0 +1,197 @@
+# Testes do diário de movimentos: recuperação após queda (_reconcile), undo e resume
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import organizer
+from organizer import (JournalState, MoveJournal, find_journals, interrupted_journals,
+                       journal_finished, organize, recover_journal, resolve_journal, undo_journal)
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def snapshot(root):
+    return sorted((os.path.relpath(os.path.join(folder, name), root), read(os.path.join(folder, name)))
+                  for folder, _, names in os.walk(root) for name in names)
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.src = os.path.join(self.tmp, "origem")
+        self.root = os.path.join(self.tmp, "Organizados")
+        os.makedirs(self.src)
+        os.makedirs(self.root)
+
+    def interrupted(self, moves, copies=None):
+        """Diário de uma execução que caiu com as intenções de moves sem conclusão"""
+        journal = MoveJournal.create(self.root)
+        ids = journal.intents(moves)
+        for index, inode in (copies or {}).items():
+            journal.copying(ids[index], inode)
+        journal.close(complete=False)
+        return journal.path
+
+    def cross_device(self):
+        """device_of() com a origem e o destino em discos diferentes"""
+        return mock.patch.object(organizer, "device_of",
+                                 lambda path: 1 if path.startswith(self.src) else 2)
+
+class ReconcileTests(JournalTestCase):
+    def test_same_device_never_deletes_foreign_destination(self):
+        src = os.path.join(self.src, "IMG_0001.jpg")
+        dst = os.path.join(self.root, "JPEG", "IMG_0001.jpg")
+        write(src, "foto da origem, maior")
+        write(dst, "outra")
+        path = self.interrupted([(src, dst)])
+
+        _, lines = recover_journal(path, "resume")
+
+        self.assertEqual(read(dst), "outra")
+        self.assertEqual(read(src), "foto da origem, maior")
+        self.assertTrue(any(line.startswith("⚠️") for line in lines))
+        self.assertTrue(journal_finished(path))
+
+    def test_default_run_keeps_foreign_destination(self):
+        src = os.path.join(self.src, "IMG_0001.jpg")
+        dst = os.path.join(self.root, "JPEG", "IMG_0001.jpg")
+        write(src, "foto da origem, maior")
+        write(dst, "outra")
+        self.interrupted([(src, dst)])
+
+        organize([("origem", self.src)], ["JPEG"], "B", self.tmp, "Organizados", False)
+
+        self.assertEqual(read(dst), "outra")
+        self.assertEqual(read(os.path.join(self.root, "JPEG", "IMG_0001 (1).jpg")),
+                         "foto da origem, maior")
+        self.assertEqual(interrupted_journals(self.root), [])
+
+    def test_confirmed_partial_copy_is_replaced(self):
+        src = os.path.join(self.src, "a.pdf")
+        dst = os.path.join(self.root, "PDF", "a.pdf")
+        write(src, "conteúdo completo")
+        write(dst, "cont")
+        path = self.interrupted([(src, dst)], {0: os.stat(dst).st_ino})
+
+        with self.cross_device():
+            moved, _ = recover_journal(path, "resume")
+
+        self.assertEqual(moved, 1)
+        self.assertEqual(read(dst), "conteúdo completo")
+        self.assertFalse(os.path.exists(src))
+
+    def test_unconfirmed_partial_copy_is_moved_aside(self):
+        src = os.path.join(self.src, "a.pdf")
+        dst = os.path.join(self.root, "PDF", "a.pdf")
+        write(src, "conteúdo completo")
+        write(dst, "cont")
+        path = self.interrupted([(src, dst)])
+
+        with self.cross_device():
+            _, lines = recover_journal(path, "resume")
+
+        self.assertEqual(read(dst + ".parcial"), "cont")
+        self.assertEqual(read(dst), "conteúdo completo")
+        self.assertTrue(any("parcial" in line for line in lines))
+
+    def test_half_done_hardlink_rename_keeps_source(self):
+        src = os.path.join(self.src, "a.txt")
+        dst = os.path.join(self.root, "Texto", "a.txt")
+        write(src, "dado")
+        os.makedirs(os.path.dirname(dst))
+        os.link(src, dst)
+        path = self.interrupted([(src, dst)])
+
+        state = JournalState(path)
+        journal = MoveJournal(path, state.next_id())
+        finished, untouched, warnings = organizer._reconcile(state, journal)
+        journal.close()
+
+        self.assertEqual((finished, warnings), ([], []))
+        self.assertEqual([move["src"] for move in untouched], [src])
+        self.assertFalse(os.path.exists(dst))
+        self.assertEqual(read(src), "dado")
+
+    def test_move_without_done_record_counts_as_finished(self):
+        src = os.path.join(self.src, "a.txt")
+        dst = os.path.join(self.root, "Texto", "a.txt")
+        write(dst, "dado")
+        path = self.interrupted([(src, dst)])
+
+        restored, _ = recover_journal(path, "rollback")
+
+        self.assertEqual(restored, 1)
+        self.assertEqual(read(src), "dado")
+        self.assertFalse(os.path.exists(dst))
+
+class UndoResumeTests(JournalTestCase):
+    def test_undo_restores_the_whole_run(self):
+        for folder in (self.src, os.path.join(self.src, "sub")):
+            for name in ("a.pdf", "b.PNG", "c.txt"):
+                write(os.path.join(folder, name), folder + name)
+        before = snapshot(self.src)
+
+        _, moved, _ = organize([("origem", self.src)], list(organizer.TIPOS), "B", self.tmp,
+                               "Organizados", True)
+        self.assertEqual(moved, 6)
+        self.assertEqual(snapshot(self.src), [])
+
+        restored, lines = undo_journal(self.root)
+
+        self.assertEqual(restored, 7)  # 6 arquivos e a pasta sub (já vazia)
+        self.assertFalse(any(line.startswith("❌") for line in lines))
+        self.assertEqual(snapshot(self.src), before)
+        self.assertTrue(journal_finished(find_journals(self.root)[-1]))
+
+    def test_resume_finishes_pending_moves(self):
+        moves = []
+        for name in ("a.pdf", "b.pdf"):
+            write(os.path.join(self.src, name), name)
+            moves.append((os.path.join(self.src, name), os.path.join(self.root, "PDF", name)))
+        path = self.interrupted(moves)
+        self.assertEqual(interrupted_journals(self.root), [path])
+
+        moved, lines = recover_journal(path, "resume")
+
+        self.assertEqual(moved, 2)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root, "PDF"))), ["a.pdf", "b.pdf"])
+        self.assertEqual(interrupted_journals(self.root), [])
+        self.assertEqual(len(JournalState(path).completed()), 2)
+
+    def test_resolve_journal_picks_the_latest_run(self):
+        with mock.patch.object(organizer.time, "time", return_value=1700000000.5):
+            first = MoveJournal.create(self.root)
+            first.close()
+            second = MoveJournal.create(self.root)
+            second.close()
+
+        self.assertNotEqual(first.path, second.path)
+        self.assertEqual(find_journals(self.root), [first.path, second.path])
+        self.assertEqual(resolve_journal(self.root), second.path)
+
+    def test_find_journals_orders_same_second_names(self):
+        folder = os.path.join(self.root, organizer.JOURNAL_DIR)
+        names = ["journal_20240101_120000 (1).jsonl", "journal_20240101_115959.jsonl",
+                 "journal_20240101_120000.jsonl", "journal_20240101_120000 (10).jsonl",
+                 "journal_20240101_120000 (2).jsonl"]
+        for name in names:
+            write(os.path.join(folder, name), "")
+
+        self.assertEqual([os.path.basename(path) for path in find_journals(self.root)],
+                         ["journal_20240101_115959.jsonl", "journal_20240101_120000.jsonl",
+                          "journal_20240101_120000 (1).jsonl", "journal_20240101_120000 (2).jsonl",
+                          "journal_20240101_120000 (10).jsonl"])
+
+if __name__ == "__main__":
+    unittest.main()
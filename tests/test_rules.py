@@ -0,0 +1,55 @@
+# Testes das regras de classificação (RuleSet)
+import os
+import sys
+import unittest
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from organizer import RuleSet, parse_size
+
+Stat = namedtuple("Stat", "st_size st_mtime")
+
+def stat_of(size):
+    return lambda: Stat(size, 0)
+
+class RuleOrderTests(unittest.TestCase):
+    def test_earlier_extension_rule_wins_over_later_pattern(self):
+        rules = RuleSet([("Grandes", {"extensoes": [".pdf"], "tamanho_min": "1MB"}),
+                         ("Relatórios", {"glob": ["rel*.pdf"]}),
+                         ("PDF", {"extensoes": [".pdf"]})])
+
+        self.assertEqual(rules.classify_name("rel1.pdf", stat_of(5 << 20)), "Grandes")
+        self.assertEqual(rules.classify_name("rel1.pdf", stat_of(5)), "Relatórios")
+        self.assertEqual(rules.classify_name("x.pdf", stat_of(5)), "PDF")
+
+    def test_earlier_pattern_wins_over_later_extension(self):
+        rules = RuleSet([("Fotos", {"regex": [r"(?i)img_\d+\.jpg"]}), ("JPEG", {"extensoes": [".jpg"]})])
+
+        self.assertEqual(rules.classify_name("IMG_01.JPG", stat_of(5)), "Fotos")
+        self.assertEqual(rules.classify_name("praia.jpg", stat_of(5)), "JPEG")
+
+    def test_compound_suffixes_follow_definition_order(self):
+        first = RuleSet([("TGZ", {"extensoes": [".tar.gz"]}), ("GZ", {"extensoes": [".gz"]})])
+        last = RuleSet([("GZ", {"extensoes": [".gz"]}), ("TGZ", {"extensoes": [".tar.gz"]})])
+
+        self.assertEqual(first.classify_name("a.tar.gz", stat_of(5)), "TGZ")
+        self.assertEqual(first.classify_name("a.gz", stat_of(5)), "GZ")
+        self.assertEqual(last.classify_name("a.tar.gz", stat_of(5)), "GZ")
+
+class ParseSizeTests(unittest.TestCase):
+    def test_units_with_and_without_b(self):
+        self.assertEqual(parse_size("500"), 500)
+        self.assertEqual(parse_size("4K"), 4096)
+        self.assertEqual(parse_size("4kb"), 4096)
+        self.assertEqual(parse_size("1.5 G"), 3 << 29)
+        self.assertEqual(parse_size("2T"), 2 << 40)
+        self.assertEqual(parse_size(123), 123)
+
+    def test_invalid_size_raises_value_error(self):
+        for value in ("4X", "KB", "1.2.3MB", ".", "-1K"):
+            with self.assertRaises(ValueError):
+                parse_size(value)
+
+if __name__ == "__main__":
+    unittest.main()